@@ -9,11 +9,31 @@ Key Production Concerns:
 3. Observability: Detailed logging of decisions and costs
 """
 
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+import ast
+import asyncio
+import functools
+import json
+import math
+import operator
+import os
+import queue
+import sys
 import time
 
+try:
+    import orjson  # Optional: pip install -e ".[agents]"
+except ImportError:
+    orjson = None
+
+
+# slots=True needs Python 3.10+; on 3.9 these stay regular dataclasses
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class ToolExecutionResult(Enum):
     """Result of tool execution."""
@@ -23,7 +43,7 @@ class ToolExecutionResult(Enum):
     INVALID_INPUT = "invalid_input"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Tool:
     """Tool that an agent can use."""
     name: str
@@ -32,11 +52,18 @@ class Tool:
     function: Callable
     timeout_seconds: float = 10.0
     cost_estimate: float = 0.0
+    # Only mark pure/idempotent tools cacheable; None TTL = never expires
+    cacheable: bool = False
+    ttl_seconds: Optional[float] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ToolExecution:
-    """Record of a tool execution."""
+    """Record of a tool execution.
+    
+    Slotted and immutable: one is created per call and kept in the
+    execution log, so long runs accumulate thousands of them.
+    """
     tool_name: str
     parameters: Dict[str, Any]
     result: ToolExecutionResult
@@ -46,6 +73,15 @@ class ToolExecution:
     cost_usd: float
 
 
+def _elapsed_ms(start_ns: int) -> float:
+    """Milliseconds since a time.perf_counter_ns() reading.
+    
+    perf_counter_ns is monotonic and high-resolution; the integer delta is
+    converted to float only once.
+    """
+    return (time.perf_counter_ns() - start_ns) / 1e6
+
+
 class AgentSafetyLimits:
     """Safety limits to prevent runaway agents."""
     
@@ -53,11 +89,15 @@ class AgentSafetyLimits:
         self,
         max_iterations: int = 15,
         max_cost_usd: float = 0.50,
-        max_total_time_seconds: float = 120.0
+        max_total_time_seconds: float = 120.0,
+        stop_on_tool_timeout: bool = True
     ):
         self.max_iterations = max_iterations
         self.max_cost_usd = max_cost_usd
         self.max_total_time_seconds = max_total_time_seconds
+        # A timed-out tool is usually environmentally dead; retrying it
+        # only burns more LLM turns
+        self.stop_on_tool_timeout = stop_on_tool_timeout
 
 
 class ToolUsingAgent:
@@ -68,6 +108,7 @@ class ToolUsingAgent:
     - Safety limits: iterations, cost, time
     - Comprehensive logging for debugging
     - Graceful error handling
+    - Independent tool calls in one turn run concurrently
     """
     
     def __init__(
@@ -80,6 +121,12 @@ class ToolUsingAgent:
         self._execution_log: List[ToolExecution] = []
         self._total_cost = 0.0
         self._start_time = 0.0
+        # Owned per agent (not shared with parent/child agents) so nested
+        # agents can never deadlock waiting on each other's workers
+        self._max_concurrency = int(os.environ.get("TOOL_CONCURRENCY_LIMIT", 8))
+        self._pool = ThreadPoolExecutor(max_workers=self._max_concurrency)
+        # tool_name + canonical params -> (output, monotonic expiry)
+        self._tool_cache: Dict[bytes, Tuple[Any, float]] = {}
     
     def run(self, task: str) -> Dict[str, Any]:
         """Execute task using available tools.
@@ -113,22 +160,76 @@ class ToolUsingAgent:
                 print(f"✓ Task complete: {result}")
                 break
             
-            if action["type"] == "use_tool":
-                tool_name = action["tool"]
-                parameters = action["parameters"]
-                
-                # Execute tool
-                execution = self._execute_tool(tool_name, parameters)
-                self._execution_log.append(execution)
-                self._total_cost += execution.cost_usd
-                
-                print(f"  Tool: {tool_name}")
-                print(f"  Result: {execution.result.value}")
-                print(f"  Cost: ${execution.cost_usd:.4f}")
-                
-                if execution.result == ToolExecutionResult.FAILURE:
-                    print(f"  Error: {execution.error_message}")
+            if action["type"] == "use_tools":
+                # Execute all calls of this turn concurrently
+                executions = self._execute_tools(action["calls"])
+                if not self._record_executions(executions):
+                    break
+        
+        return self._run_summary(result, task_complete, iterations)
+    
+    async def arun(self, task: str) -> Dict[str, Any]:
+        """Async variant of run() for network-bound tools.
+        
+        Tool calls of a turn fan out with asyncio.gather under a semaphore
+        instead of blocking a thread each: coroutine tools are awaited
+        directly (and can share one pooled HTTP client session), sync tools
+        run on the agent's pool.
+        """
+        print(f"=== Agent Task: {task} ===\n")
+        self._start_time = time.monotonic()  # Monotonic for accurate elapsed time
+        self._execution_log = []
+        self._total_cost = 0.0
+        
+        iterations = 0
+        task_complete = False
+        result = None
+        
+        while not task_complete and iterations < self.safety_limits.max_iterations:
+            iterations += 1
+            print(f"\n--- Iteration {iterations} ---")
+            
+            if not self._check_safety_limits(iterations):
+                break
+            
+            action = self._decide_next_action(task, iterations)
+            
+            if action["type"] == "complete":
+                task_complete = True
+                result = action["result"]
+                print(f"✓ Task complete: {result}")
+                break
+            
+            if action["type"] == "use_tools":
+                executions = await self._aexecute_tools(action["calls"])
+                if not self._record_executions(executions):
+                    break
+        
+        return self._run_summary(result, task_complete, iterations)
+    
+    def _record_executions(self, executions: List[ToolExecution]) -> bool:
+        """Log a turn's executions; return False if the run should stop."""
+        for execution in executions:
+            self._execution_log.append(execution)
+            self._total_cost += execution.cost_usd
+            
+            print(f"  Tool: {execution.tool_name}")
+            print(f"  Result: {execution.result.value}")
+            print(f"  Cost: ${execution.cost_usd:.4f}")
+            
+            if execution.result != ToolExecutionResult.SUCCESS:
+                print(f"  Error: {execution.error_message}")
+        
+        if self.safety_limits.stop_on_tool_timeout and any(
+            e.result == ToolExecutionResult.TIMEOUT for e in executions
+        ):
+            print("✗ Tool timed out, stopping")
+            return False
         
+        return True
+    
+    def _run_summary(self, result: Any, task_complete: bool, iterations: int) -> Dict[str, Any]:
+        """Build the result dict returned by run()/arun()."""
         elapsed = time.monotonic() - self._start_time
         
         return {
@@ -160,12 +261,22 @@ class ToolUsingAgent:
         In production: Use LLM with tool descriptions in prompt.
         This is a mock implementation for demonstration.
         """
-        # Mock decision logic
-        if iteration <= 2:
+        # Mock decision logic: LLMs routinely emit several independent
+        # tool calls in a single turn
+        if iteration == 1:
+            return {
+                "type": "use_tools",
+                "calls": [
+                    {"tool": "search_database", "parameters": {"query": task}},
+                    {"tool": "fetch_api", "parameters": {"endpoint": "/auth/docs"}},
+                ]
+            }
+        elif iteration == 2:
             return {
-                "type": "use_tool",
-                "tool": "search_database",
-                "parameters": {"query": task}
+                "type": "use_tools",
+                "calls": [
+                    {"tool": "search_database", "parameters": {"query": task}}
+                ]
             }
         else:
             return {
@@ -173,61 +284,300 @@ class ToolUsingAgent:
                 "result": "Task completed based on tool outputs"
             }
     
+    def _execute_tools(self, calls: List[Dict[str, Any]]) -> List[ToolExecution]:
+        """Execute independent tool calls concurrently.
+        
+        Wall-clock per turn is ~max(latency) instead of sum(latency) for
+        I/O-bound tools. Every call runs to completion or timeout (like
+        Promise.allSettled): one failure never cancels its siblings.
+        Executions are returned in submission order so the log stays
+        deterministic regardless of completion order.
+        """
+        # Submit everything first so all calls run in parallel, then
+        # collect; each call's deadline counts from its own submission
+        submitted = []
+        for call in calls:
+            tool_name, parameters = call["tool"], call["parameters"]
+            cached = self._lookup_tool_cache(tool_name, parameters)
+            if cached is not None:
+                submitted.append(cached)
+            else:
+                submitted.append(
+                    (tool_name, parameters, *self._submit_tool(tool_name, parameters))
+                )
+        
+        return [
+            entry if isinstance(entry, ToolExecution) else self._collect_tool(*entry)
+            for entry in submitted
+        ]
+    
     def _execute_tool(
         self,
         tool_name: str,
         parameters: Dict[str, Any]
     ) -> ToolExecution:
-        """Execute a tool with timeout and error handling.
+        """Execute a single tool with caching, timeout and error handling."""
+        return self._execute_tools([{"tool": tool_name, "parameters": parameters}])[0]
+    
+    @staticmethod
+    def _tool_cache_key(tool_name: str, parameters: Dict[str, Any]) -> Optional[bytes]:
+        """Canonical cache key: identical parameters in any order map together.
+        
+        orjson sorts keys in Rust and returns bytes directly (~10x faster
+        than json.dumps(sort_keys=True)); stdlib json is the fallback.
+        
+        None when the parameters aren't JSON-serializable: that call is
+        simply not cached. No str() fallback, since distinct values with
+        the same str() (e.g. truncated numpy arrays) would share a key.
+        """
+        try:
+            if orjson is not None:
+                params = orjson.dumps(
+                    parameters, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                )
+            else:
+                params = json.dumps(parameters, sort_keys=True, separators=(",", ":")).encode()
+        except (TypeError, ValueError):
+            return None
+        return tool_name.encode() + b"\x00" + params
+    
+    def _lookup_tool_cache(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any]
+    ) -> Optional[ToolExecution]:
+        """Return a zero-cost execution if a fresh cached output exists."""
+        tool = self.tools.get(tool_name)
+        if tool is None or not tool.cacheable:
+            return None
+        
+        key = self._tool_cache_key(tool_name, parameters)
+        if key is None:
+            return None
+        hit = self._tool_cache.get(key)
+        if hit is None:
+            return None
+        
+        output, expires_at = hit
+        if expires_at <= time.monotonic():
+            del self._tool_cache[key]
+            return None
         
-        Production: Implement actual timeout using:
-        - concurrent.futures.ThreadPoolExecutor with timeout
-        - signal.alarm() on Unix systems
-        - threading.Timer for async timeout
-        This example shows the pattern without actual timeout for simplicity.
+        print(f"  Cache hit: {tool_name} (saved ${tool.cost_estimate:.4f})")
+        return ToolExecution(
+            tool_name=tool_name,
+            parameters=parameters,
+            result=ToolExecutionResult.SUCCESS,
+            output=output,
+            error_message=None,
+            execution_time_ms=0.0,
+            cost_usd=0.0
+        )
+    
+    def _submit_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any]
+    ) -> Tuple[Optional[Future], "queue.SimpleQueue"]:
+        """Queue a tool call on the agent's pool (None for unknown tools).
+        
+        The returned queue receives the call's start time once a worker
+        picks it up.
         """
+        started: queue.SimpleQueue = queue.SimpleQueue()
         if tool_name not in self.tools:
-            return ToolExecution(
-                tool_name=tool_name,
-                parameters=parameters,
-                result=ToolExecutionResult.FAILURE,
-                output=None,
-                error_message=f"Unknown tool: {tool_name}",
-                execution_time_ms=0.0,
-                cost_usd=0.0
+            return None, started
+        future = self._pool.submit(
+            self._timed_call, self.tools[tool_name].function, parameters, started
+        )
+        return future, started
+    
+    @staticmethod
+    def _timed_call(
+        function: Callable,
+        parameters: Dict[str, Any],
+        started: "queue.SimpleQueue"
+    ) -> Tuple[Any, Optional[Exception], float]:
+        """Run a tool on a worker, timing only the call itself.
+        
+        Collection happens in submission order, so timing at collection
+        would charge fast tools for the slow ones submitted before them.
+        """
+        start_ns = time.perf_counter_ns()
+        started.put(start_ns)
+        try:
+            output = function(**parameters)
+            return output, None, _elapsed_ms(start_ns)
+        except Exception as e:
+            return None, e, _elapsed_ms(start_ns)
+    
+    def _collect_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        future: Optional[Future],
+        started: "queue.SimpleQueue"
+    ) -> ToolExecution:
+        """Wait for a submitted tool call, enforcing its timeout.
+        
+        The deadline runs from when a worker starts the call, not from
+        submission: time queued behind other calls of the turn is not the
+        tool's fault (arun likewise starts its clock inside the semaphore).
+        Calls are collected in submission order, so everything queued ahead
+        of this one has finished or timed out by now; if it still can't
+        start within its timeout, the workers are stuck on earlier
+        timed-out calls and it times out too.
+        
+        Note: Python threads cannot be killed. A timed-out call is cancelled
+        if it has not started yet; otherwise it keeps its worker until the
+        tool returns, so tools should still set their own I/O timeouts.
+        """
+        if future is None:
+            return self._tool_execution(
+                tool_name, parameters, ToolExecutionResult.FAILURE,
+                error_message=f"Unknown tool: {tool_name}"
             )
         
         tool = self.tools[tool_name]
-        start_time = time.time()
         
         try:
-            # Execute with timeout (production: use proper timeout mechanism)
-            output = tool.function(**parameters)
-            
-            execution_time = (time.time() - start_time) * 1000
-            
-            return ToolExecution(
-                tool_name=tool_name,
-                parameters=parameters,
-                result=ToolExecutionResult.SUCCESS,
-                output=output,
-                error_message=None,
-                execution_time_ms=execution_time,
-                cost_usd=tool.cost_estimate
+            start_ns = started.get(timeout=tool.timeout_seconds)
+        except queue.Empty:
+            future.cancel()
+            return self._tool_execution(
+                tool_name, parameters, ToolExecutionResult.TIMEOUT,
+                error_message=f"No free worker within {tool.timeout_seconds}s"
             )
-            
-        except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
-            
-            return ToolExecution(
-                tool_name=tool_name,
-                parameters=parameters,
-                result=ToolExecutionResult.FAILURE,
-                output=None,
-                error_message=str(e),
-                execution_time_ms=execution_time,
-                cost_usd=0.0
+        
+        remaining = tool.timeout_seconds - _elapsed_ms(start_ns) / 1000
+        try:
+            output, error, execution_time = future.result(timeout=max(remaining, 0.0))
+        except FuturesTimeoutError:
+            return self._tool_execution(
+                tool_name, parameters, ToolExecutionResult.TIMEOUT,
+                error_message=f"Timed out after {tool.timeout_seconds}s",
+                execution_time_ms=_elapsed_ms(start_ns)
+            )
+        
+        if error is not None:
+            return self._tool_execution(
+                tool_name, parameters, ToolExecutionResult.FAILURE,
+                error_message=str(error), execution_time_ms=execution_time
+            )
+        
+        return self._tool_execution(
+            tool_name, parameters, ToolExecutionResult.SUCCESS,
+            output=output, execution_time_ms=execution_time
+        )
+    
+    async def _aexecute_tools(self, calls: List[Dict[str, Any]]) -> List[ToolExecution]:
+        """Async fan-out of a turn's tool calls, bounded by a semaphore.
+        
+        Like _execute_tools, failures are isolated per call and results
+        keep submission order.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        outcomes = await asyncio.gather(
+            *[
+                self._aexecute_tool(call["tool"], call["parameters"], semaphore)
+                for call in calls
+            ],
+            return_exceptions=True
+        )
+        
+        return [
+            outcome if isinstance(outcome, ToolExecution) else self._tool_execution(
+                call["tool"], call["parameters"], ToolExecutionResult.FAILURE,
+                error_message=str(outcome)
+            )
+            for call, outcome in zip(calls, outcomes)
+        ]
+    
+    async def _aexecute_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> ToolExecution:
+        """Execute one tool call with caching and asyncio timeout.
+        
+        Unlike the thread path, asyncio.wait_for really cancels coroutine
+        tools on timeout; sync tools still finish on their worker thread.
+        """
+        cached = self._lookup_tool_cache(tool_name, parameters)
+        if cached is not None:
+            return cached
+        
+        if tool_name not in self.tools:
+            return self._tool_execution(
+                tool_name, parameters, ToolExecutionResult.FAILURE,
+                error_message=f"Unknown tool: {tool_name}"
             )
+        
+        tool = self.tools[tool_name]
+        
+        async with semaphore:
+            start_ns = time.perf_counter_ns()
+            try:
+                if asyncio.iscoroutinefunction(tool.function):
+                    call = tool.function(**parameters)
+                else:
+                    call = asyncio.get_running_loop().run_in_executor(
+                        self._pool, functools.partial(tool.function, **parameters)
+                    )
+                output = await asyncio.wait_for(call, timeout=tool.timeout_seconds)
+            except asyncio.TimeoutError:
+                return self._tool_execution(
+                    tool_name, parameters, ToolExecutionResult.TIMEOUT,
+                    error_message=f"Timed out after {tool.timeout_seconds}s",
+                    execution_time_ms=_elapsed_ms(start_ns)
+                )
+            except Exception as e:
+                return self._tool_execution(
+                    tool_name, parameters, ToolExecutionResult.FAILURE,
+                    error_message=str(e),
+                    execution_time_ms=_elapsed_ms(start_ns)
+                )
+        
+        return self._tool_execution(
+            tool_name, parameters, ToolExecutionResult.SUCCESS,
+            output=output, execution_time_ms=_elapsed_ms(start_ns)
+        )
+    
+    def _tool_execution(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        result: ToolExecutionResult,
+        output: Any = None,
+        error_message: Optional[str] = None,
+        execution_time_ms: float = 0.0
+    ) -> ToolExecution:
+        """Record an executed call; successes are charged and cached."""
+        cost_usd = 0.0
+        
+        if result == ToolExecutionResult.SUCCESS:
+            tool = self.tools[tool_name]
+            cost_usd = tool.cost_estimate
+            
+            key = self._tool_cache_key(tool_name, parameters) if tool.cacheable else None
+            if key is not None:
+                ttl = tool.ttl_seconds if tool.ttl_seconds is not None else math.inf
+                self._tool_cache[key] = (output, time.monotonic() + ttl)
+        
+        return ToolExecution(
+            tool_name=tool_name,
+            parameters=parameters,
+            result=result,
+            output=output,
+            error_message=error_message,
+            execution_time_ms=execution_time_ms,
+            cost_usd=cost_usd
+        )
+    
+    def close(self):
+        """Release the agent's worker threads."""
+        self._pool.shutdown(wait=True)
 
 
 # Example tools
@@ -243,19 +593,71 @@ def fetch_api(endpoint: str) -> Dict[str, Any]:
     return {"data": f"Data from {endpoint}", "status": 200}
 
 
+# Arithmetic allowed in calculate(); anything else in the AST is rejected
+_CALC_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_CALC_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+# Python ints are unbounded, so cap their size: (((9 ** 99) ** 99) ** 99) ** 99
+# would pin a CPU for minutes. Floats overflow cheaply and need no cap.
+_CALC_MAX_INT_BITS = 4096
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expression(expression: str) -> ast.expr:
+    """Parse once per distinct expression; agents repeat the same ones."""
+    return ast.parse(expression, mode="eval").body
+
+
+def _eval_node(node: ast.expr) -> float:
+    """Evaluate a parsed arithmetic expression by walking its AST."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in _CALC_BINARY_OPS:
+        left = _eval_node(node.left)
+        right = _eval_node(node.right)
+        # Bound the result before computing it: int ** int has about
+        # right * log2(|left|) bits
+        if (
+            isinstance(node.op, ast.Pow)
+            and isinstance(left, int) and isinstance(right, int)
+            and abs(left) > 1 and right * math.log2(abs(left)) > _CALC_MAX_INT_BITS
+        ):
+            raise ValueError(f"Result too large: over {_CALC_MAX_INT_BITS} bits")
+        result = _CALC_BINARY_OPS[type(node.op)](left, right)
+        # Other operators can only grow an int a few bits per node, but
+        # chains of them still compound: cap every intermediate result
+        if isinstance(result, int) and result.bit_length() > _CALC_MAX_INT_BITS:
+            raise ValueError(f"Result too large: {result.bit_length()} bits")
+        return result
+    
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _CALC_UNARY_OPS:
+        return _CALC_UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    
+    raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+
 def calculate(expression: str) -> float:
     """Perform calculation.
     
-    WARNING: This is a simplified example. In production, NEVER use eval().
-    Use a safe math parser like ast.literal_eval() or a library like simpleeval.
+    Never uses eval(): the expression is parsed to an AST (cached per
+    expression) and only numeric literals and arithmetic operators are
+    evaluated. Names, calls, attributes, etc. are rejected. Integer
+    results are capped at _CALC_MAX_INT_BITS bits, checked before a power
+    is computed, so nested powers can't pin a CPU.
     """
-    # For demo purposes only - DO NOT use eval() in production
-    # Production: Use safe alternatives like numexpr or simpleeval
     try:
-        # Very basic safety check (still not safe!)
-        if any(keyword in expression for keyword in ['import', '__', 'exec', 'eval']):
-            raise ValueError("Invalid expression")
-        return eval(expression)
+        return _eval_node(_parse_expression(expression))
     except Exception as e:
         raise ValueError(f"Invalid calculation: {e}")
 
@@ -271,7 +673,9 @@ def main():
             description="Search internal database for information",
             parameters={"query": "search query string"},
             function=search_database,
-            cost_estimate=0.001
+            cost_estimate=0.001,
+            cacheable=True,
+            ttl_seconds=300.0
         ),
         Tool(
             name="fetch_api",
@@ -285,7 +689,8 @@ def main():
             description="Perform mathematical calculation",
             parameters={"expression": "mathematical expression"},
             function=calculate,
-            cost_estimate=0.0
+            cost_estimate=0.0,
+            cacheable=True
         ),
     ]
     
@@ -301,6 +706,7 @@ def main():
     # Run task
     task = "Find information about user authentication"
     result = agent.run(task)
+    agent.close()
     
     print("\n" + "="*50)
     print("\nFinal Results:")
@@ -316,6 +722,8 @@ def main():
     print("3. Handle tool failures gracefully")
     print("4. Monitor costs in real-time, kill if exceeded")
     print("5. Clear tool descriptions improve selection accuracy")
+    print("6. Run independent tool calls concurrently to cut latency")
+    print("7. Cache deterministic tool outputs instead of re-executing")
 
 
 if __name__ == "__main__":
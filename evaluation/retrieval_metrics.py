@@ -11,17 +11,39 @@ Key Production Concerns:
 
 from typing import List, Dict, Set, Tuple
 from dataclasses import dataclass
-import statistics
+import sys
 
+import numpy as np
 
-@dataclass
+
+# slots=True needs Python 3.10+; on 3.9 these stay regular dataclasses
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# Position discounts 1 / log2(rank + 1) for rank = 1, 2, ... and their
+# running sums (ideal DCG for n relevant docs = _IDEAL_DCG[n]). Computed once
+# at import and extended on demand, so NDCG never recomputes log2.
+_DISCOUNTS = 1.0 / np.log2(np.arange(2, 1026))
+_IDEAL_DCG = np.concatenate(([0.0], np.cumsum(_DISCOUNTS)))
+
+
+def _discount_tables(k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (discounts for k positions, ideal DCG for 0..k hits)."""
+    global _DISCOUNTS, _IDEAL_DCG
+    if k > len(_DISCOUNTS):
+        _DISCOUNTS = 1.0 / np.log2(np.arange(2, 2 * k + 2))
+        _IDEAL_DCG = np.concatenate(([0.0], np.cumsum(_DISCOUNTS)))
+    return _DISCOUNTS[:k], _IDEAL_DCG[:k + 1]
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Query:
     """A test query with ground truth relevant documents."""
     query_text: str
     relevant_doc_ids: Set[str]
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class RetrievalResult:
     """Results from a retrieval system."""
     query_text: str
@@ -35,8 +57,25 @@ class RetrievalMetrics:
     - Track multiple metrics (MRR, NDCG, Precision, Recall)
     - Use ground truth test set
     - Monitor trends over time
+    
+    The @k metrics encode the results once as a (queries x k) 0/1 hit
+    matrix and reduce it with NumPy, so large test sets (10k+ queries)
+    avoid per-document Python loops in the math.
     """
     
+    @staticmethod
+    def _hit_matrix(results: List[Tuple[Query, RetrievalResult]], k: int) -> np.ndarray:
+        """Build hits[i, j] = 1 if the j-th retrieved doc of query i is relevant.
+        
+        Rows are zero-padded to k columns.
+        """
+        hits = np.zeros((len(results), k), dtype=np.int8)
+        for i, (query, result) in enumerate(results):
+            relevant = query.relevant_doc_ids
+            row = [doc_id in relevant for doc_id in result.retrieved_doc_ids[:k]]
+            hits[i, :len(row)] = row
+        return hits
+    
     @staticmethod
     def mean_reciprocal_rank(results: List[Tuple[Query, RetrievalResult]]) -> float:
         """Calculate Mean Reciprocal Rank (MRR).
@@ -46,21 +85,22 @@ class RetrievalMetrics:
         
         When to use: When first result matters most (e.g., Q&A).
         """
-        reciprocal_ranks = []
+        if not results:
+            return 0.0
         
+        # Only the first hit matters, so a short-circuiting scan per query
+        # beats materializing full-width hit rows
+        reciprocal_ranks = 0.0
         for query, result in results:
-            rank = None
-            for i, doc_id in enumerate(result.retrieved_doc_ids, 1):
-                if doc_id in query.relevant_doc_ids:
-                    rank = i
-                    break
-            
+            relevant = query.relevant_doc_ids
+            rank = next(
+                (i for i, doc_id in enumerate(result.retrieved_doc_ids, 1) if doc_id in relevant),
+                0
+            )
             if rank:
-                reciprocal_ranks.append(1.0 / rank)
-            else:
-                reciprocal_ranks.append(0.0)
+                reciprocal_ranks += 1.0 / rank
         
-        return statistics.mean(reciprocal_ranks) if reciprocal_ranks else 0.0
+        return reciprocal_ranks / len(results)
     
     @staticmethod
     def precision_at_k(results: List[Tuple[Query, RetrievalResult]], k: int = 5) -> float:
@@ -70,17 +110,11 @@ class RetrievalMetrics:
         
         When to use: When accuracy of top results matters.
         """
-        precisions = []
-        
-        for query, result in results:
-            top_k = result.retrieved_doc_ids[:k]
-            relevant_in_top_k = len([
-                doc_id for doc_id in top_k 
-                if doc_id in query.relevant_doc_ids
-            ])
-            precisions.append(relevant_in_top_k / k)
+        if not results:
+            return 0.0
         
-        return statistics.mean(precisions) if precisions else 0.0
+        hits = RetrievalMetrics._hit_matrix(results, k)
+        return float((hits.sum(axis=1) / k).mean())
     
     @staticmethod
     def recall_at_k(results: List[Tuple[Query, RetrievalResult]], k: int = 5) -> float:
@@ -90,20 +124,14 @@ class RetrievalMetrics:
         
         When to use: When completeness matters.
         """
-        recalls = []
+        # Queries without ground truth are excluded from the average
+        results = [(query, result) for query, result in results if query.relevant_doc_ids]
+        if not results:
+            return 0.0
         
-        for query, result in results:
-            if not query.relevant_doc_ids:
-                continue
-            
-            top_k = result.retrieved_doc_ids[:k]
-            relevant_in_top_k = len([
-                doc_id for doc_id in top_k 
-                if doc_id in query.relevant_doc_ids
-            ])
-            recalls.append(relevant_in_top_k / len(query.relevant_doc_ids))
-        
-        return statistics.mean(recalls) if recalls else 0.0
+        hits = RetrievalMetrics._hit_matrix(results, k)
+        num_relevant = np.array([len(query.relevant_doc_ids) for query, _ in results])
+        return float((hits.sum(axis=1) / num_relevant).mean())
     
     @staticmethod
     def ndcg_at_k(
@@ -121,38 +149,22 @@ class RetrievalMetrics:
         Note: Uses standard log2 discounting for accurate NDCG calculation.
         Production: Use graded relevance scores (0-3 or 0-5) for better evaluation.
         """
-        import math
+        if not results:
+            return 0.0
         
-        ndcgs = []
+        hits = RetrievalMetrics._hit_matrix(results, k)
         
-        for query, result in results:
-            # Calculate DCG (Discounted Cumulative Gain)
-            dcg = 0.0
-            for i, doc_id in enumerate(result.retrieved_doc_ids[:k], 1):
-                if doc_id in query.relevant_doc_ids:
-                    # Binary relevance: rel=1 if relevant, 0 otherwise
-                    rel = 1.0
-                    # Discount by position using standard log2 formula
-                    dcg += rel / math.log2(i + 1)
-            
-            # Calculate IDCG (Ideal DCG)
-            ideal_ranking = sorted(
-                result.retrieved_doc_ids[:k],
-                key=lambda d: 1 if d in query.relevant_doc_ids else 0,
-                reverse=True
-            )
-            idcg = 0.0
-            for i, doc_id in enumerate(ideal_ranking[:k], 1):
-                if doc_id in query.relevant_doc_ids:
-                    idcg += 1.0 / math.log2(i + 1)
-            
-            # Normalize
-            if idcg > 0:
-                ndcgs.append(dcg / idcg)
-            else:
-                ndcgs.append(0.0)
+        # Binary relevance discounted by position: 1 / log2(rank + 1)
+        discounts, ideal_dcg = _discount_tables(k)
+        dcg = hits @ discounts
+        
+        # Ideal DCG only depends on how many relevant docs are in the top-k
+        # (all ranked first), so look it up in the running discount sum
+        # instead of building an ideal ranking per query
+        idcg = ideal_dcg[hits.sum(axis=1)]
         
-        return statistics.mean(ndcgs) if ndcgs else 0.0
+        ndcg = np.divide(dcg, idcg, out=np.zeros_like(dcg), where=idcg > 0)
+        return float(ndcg.mean())
 
 
 def create_test_set() -> List[Query]:
@@ -9,11 +9,17 @@ Key Production Concerns:
 3. Observability: Track latency, errors, and costs per provider
 """
 
-from typing import Iterator, List, Optional, Dict, Any
-from dataclasses import dataclass
+from typing import Iterator, List, Optional, Dict, Any, Tuple, Union
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
 from enum import Enum
+import asyncio
+import hashlib
+import json
 import time
 import random
+import sys
+import threading
 
 
 class ProviderType(Enum):
@@ -23,7 +29,11 @@ class ProviderType(Enum):
     COHERE = "cohere"
 
 
-@dataclass
+# slots=True needs Python 3.10+; on 3.9 these stay regular dataclasses
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class LLMResponse:
     """Standardized response from any LLM provider."""
     text: str
@@ -32,6 +42,11 @@ class LLMResponse:
     tokens_used: int
     latency_ms: float
     cost_usd: float
+    cache_read_tokens: int = 0  # Prompt-prefix tokens served from provider cache
+    cache_write_tokens: int = 0  # Prompt-prefix tokens written to provider cache
+    # Hedged requests: one entry per provider attempt (provider, model,
+    # latency_ms, status "ok" | "error" | "cancelled")
+    attempts: List[Dict[str, Any]] = field(default_factory=list)
 
 
 @dataclass
@@ -42,48 +57,73 @@ class ProviderConfig:
     max_retries: int = 3
     timeout_seconds: float = 30.0
     cost_per_1k_tokens: float = 0.002
+    # Prompt caching price multipliers on input tokens (Anthropic-style:
+    # reads ~0.1x, writes ~1.25x; OpenAI caches automatically, reads ~0.5x)
+    cache_read_cost_multiplier: float = 0.1
+    cache_write_cost_multiplier: float = 1.25
 
 
 class CircuitBreaker:
     """Circuit breaker to prevent cascading failures.
     
     Pattern: If a provider fails repeatedly, stop trying for a cooldown period.
+    
+    Thread-safe: state transitions happen under a lock, so concurrent
+    failures aren't lost and only one thread performs the half-open reset.
+    The common path (breaker closed, call succeeds) never takes the lock.
     """
     
     def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 60.0):
         self.failure_threshold = failure_threshold
         self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
         self._failures = 0
         self._last_failure_time = 0.0  # Use time.monotonic() to avoid clock adjustments
         self._is_open = False
     
     def record_success(self):
         """Record successful call."""
-        self._failures = 0
-        self._is_open = False
+        # Already healthy: nothing to reset (attribute reads are atomic)
+        if not self._failures and not self._is_open:
+            return
+        
+        with self._lock:
+            self._failures = 0
+            self._is_open = False
     
     def record_failure(self):
         """Record failed call."""
-        self._failures += 1
-        self._last_failure_time = time.monotonic()  # Monotonic for reliable timing
+        with self._lock:
+            self._failures += 1
+            self._last_failure_time = time.monotonic()  # Monotonic for reliable timing
+            
+            opened = self._failures >= self.failure_threshold and not self._is_open
+            if opened:
+                self._is_open = True
+            failures = self._failures
         
-        if self._failures >= self.failure_threshold:
-            self._is_open = True
-            print(f"Circuit breaker OPEN after {self._failures} failures")
+        if opened:
+            print(f"Circuit breaker OPEN after {failures} failures")
     
     def can_attempt(self) -> bool:
         """Check if we should attempt to call this provider."""
         if not self._is_open:
             return True
         
-        # Check if cooldown period has passed
-        if time.monotonic() - self._last_failure_time > self.cooldown_seconds:
-            print("Circuit breaker attempting reset...")
+        with self._lock:
+            # Another thread may have reset it while we waited for the lock
+            if not self._is_open:
+                return True
+            
+            # Check if cooldown period has passed
+            if time.monotonic() - self._last_failure_time <= self.cooldown_seconds:
+                return False
+            
             self._is_open = False
             self._failures = 0
-            return True
         
-        return False
+        print("Circuit breaker attempting reset...")
+        return True
 
 
 class LLMProvider:
@@ -92,24 +132,130 @@ class LLMProvider:
     def __init__(self, config: ProviderConfig):
         self.config = config
         self.circuit_breaker = CircuitBreaker()
+        self._cached_prefixes = set()  # Mock of the provider-side prefix cache
     
-    def complete(self, prompt: str, **kwargs) -> LLMResponse:
+    def complete(self, prompt: str, system: str = "", context: str = "", **kwargs) -> LLMResponse:
         """Generate completion from prompt.
         
+        Args:
+            prompt: Dynamic per-request part (e.g. the user question)
+            system: Static system prompt, reused across requests
+            context: Slow-changing context (e.g. RAG documents)
+        
+        system and context form the cacheable prefix; keeping everything
+        static at the front and dynamic at the end maximizes prefix cache
+        hits (up to ~90% cheaper input tokens and lower TTFT).
+        
         In production: Implement actual API calls with retry logic.
         """
         if not self.circuit_breaker.can_attempt():
             raise Exception(f"Circuit breaker open for {self.config.provider.value}")
         
         try:
-            response = self._call_api(prompt, **kwargs)
+            response = self._call_api(self._build_request(prompt, system, context), **kwargs)
+            self.circuit_breaker.record_success()
+            return response
+        except Exception as e:
+            self.circuit_breaker.record_failure()
+            raise
+    
+    async def acomplete(
+        self,
+        prompt: str,
+        system: str = "",
+        context: str = "",
+        **kwargs
+    ) -> LLMResponse:
+        """Async variant of complete(); shares the same circuit breaker."""
+        if not self.circuit_breaker.can_attempt():
+            raise Exception(f"Circuit breaker open for {self.config.provider.value}")
+        
+        try:
+            response = await self._acall_api(
+                self._build_request(prompt, system, context), **kwargs
+            )
             self.circuit_breaker.record_success()
             return response
         except Exception as e:
             self.circuit_breaker.record_failure()
             raise
     
-    def _call_api(self, prompt: str, **kwargs) -> LLMResponse:
+    def stream(
+        self,
+        prompt: str,
+        system: str = "",
+        context: str = "",
+        flush_interval_s: float = 0.2,
+        flush_tokens: int = 16,
+        **kwargs
+    ) -> Iterator[str]:
+        """Stream the completion as text chunks.
+        
+        The first text arrives after ~one round trip instead of after the
+        whole generation. Tokens are batched and flushed every
+        flush_interval_s or flush_tokens, whichever comes first: per-token
+        yields cost more in overhead (and downstream writes) than they save.
+        """
+        if not self.circuit_breaker.can_attempt():
+            raise Exception(f"Circuit breaker open for {self.config.provider.value}")
+        
+        buffer: List[str] = []
+        last_flush = time.monotonic()
+        try:
+            for token in self._stream_api(self._build_request(prompt, system, context), **kwargs):
+                buffer.append(token)
+                if len(buffer) >= flush_tokens or time.monotonic() - last_flush >= flush_interval_s:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    last_flush = time.monotonic()
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+        
+        if buffer:
+            yield "".join(buffer)
+        self.circuit_breaker.record_success()
+    
+    def _build_request(self, prompt: str, system: str, context: str) -> Dict[str, Any]:
+        """Build the provider payload with the static prefix first.
+        
+        Anthropic needs explicit cache_control breakpoints on the static
+        blocks; OpenAI caches identical prefixes automatically, so ordering
+        alone is enough.
+        """
+        if self.config.provider == ProviderType.ANTHROPIC:
+            cached = {"type": "ephemeral"}
+            user_content = []
+            if context:
+                user_content.append({"type": "text", "text": context, "cache_control": cached})
+            user_content.append({"type": "text", "text": prompt})
+            request = {"messages": [{"role": "user", "content": user_content}]}
+            if system:
+                request["system"] = [{"type": "text", "text": system, "cache_control": cached}]
+            return request
+        
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        if context:
+            messages.append({"role": "user", "content": context})
+        messages.append({"role": "user", "content": prompt})
+        return {"messages": messages}
+    
+    @staticmethod
+    def _split_request(request: Dict[str, Any]) -> Tuple[str, str]:
+        """Return (static prefix, dynamic suffix) text of a built request."""
+        if isinstance(request["messages"][-1]["content"], list):
+            blocks = request.get("system", []) + request["messages"][-1]["content"]
+            prefix = "".join(b["text"] for b in blocks if "cache_control" in b)
+            suffix = "".join(b["text"] for b in blocks if "cache_control" not in b)
+            return prefix, suffix
+        
+        messages = request["messages"]
+        prefix = "".join(m["content"] for m in messages[:-1])
+        return prefix, messages[-1]["content"]
+    
+    def _call_api(self, request: Dict[str, Any], **kwargs) -> LLMResponse:
         """Mock API call. In production: implement real API call."""
         # Simulate API latency
         time.sleep(0.1)
@@ -118,19 +264,124 @@ class LLMProvider:
         if random.random() < 0.05:
             raise Exception(f"API error from {self.config.provider.value}")
         
-        tokens = len(prompt.split())  # Rough estimate
-        cost = (tokens / 1000) * self.config.cost_per_1k_tokens
+        return self._mock_response(request)
+    
+    def _stream_api(self, request: Dict[str, Any], **kwargs) -> Iterator[str]:
+        """Mock streaming API call yielding one token at a time.
+        
+        In production: iterate the provider's SSE stream (stream=True).
+        """
+        # Simulate time to first token
+        time.sleep(0.05)
+        
+        # Simulate occasional failures (5% failure rate)
+        if random.random() < 0.05:
+            raise Exception(f"API error from {self.config.provider.value}")
+        
+        for i in range(40):
+            time.sleep(0.005)  # Simulate per-token decode time
+            yield f"token{i} "
+    
+    async def _acall_api(self, request: Dict[str, Any], **kwargs) -> LLMResponse:
+        """Async mock API call.
+        
+        In production: await a long-lived httpx.AsyncClient held per provider
+        (connection pooling reuses TCP/TLS across calls).
+        """
+        # Simulate API latency without blocking the event loop
+        await asyncio.sleep(0.1)
+        
+        # Simulate occasional failures (5% failure rate)
+        if random.random() < 0.05:
+            raise Exception(f"API error from {self.config.provider.value}")
+        
+        return self._mock_response(request)
+    
+    def _mock_response(self, request: Dict[str, Any]) -> LLMResponse:
+        """Build the mock response shared by the sync and async paths.
+        
+        Simulates provider prefix caching: the first request with a given
+        prefix pays the cache-write rate, later ones the cache-read rate.
+        Real APIs report these as cache_creation_input_tokens /
+        cache_read_input_tokens (Anthropic) or cached_tokens (OpenAI).
+        """
+        prefix, suffix = self._split_request(request)
+        prefix_tokens = len(prefix.split())  # Rough estimate
+        suffix_tokens = len(suffix.split())
+        
+        cache_read_tokens = cache_write_tokens = 0
+        if prefix_tokens:
+            if prefix in self._cached_prefixes:
+                cache_read_tokens = prefix_tokens
+            else:
+                self._cached_prefixes.add(prefix)
+                cache_write_tokens = prefix_tokens
+        
+        billed_tokens = (
+            suffix_tokens
+            + cache_read_tokens * self.config.cache_read_cost_multiplier
+            + cache_write_tokens * self.config.cache_write_cost_multiplier
+        )
+        cost = (billed_tokens / 1000) * self.config.cost_per_1k_tokens
         
         return LLMResponse(
             text=f"Response from {self.config.model}",
             model=self.config.model,
             provider=self.config.provider,
-            tokens_used=tokens,
+            tokens_used=prefix_tokens + suffix_tokens,
             latency_ms=100.0,
-            cost_usd=cost
+            cost_usd=cost,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens
         )
 
 
+class ResponseCache:
+    """Exact-match LRU cache of LLM responses with a TTL.
+    
+    Only safe for deterministic requests (temperature 0): sampled outputs
+    are meant to differ between calls.
+    In production, use Redis or similar so all replicas share hits.
+    """
+    
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (response, monotonic expiry), least recently used first
+        self._entries: "OrderedDict[str, Tuple[LLMResponse, float]]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(models: List[str], prompt: str, kwargs: Dict[str, Any]) -> str:
+        """Deterministic key over the model chain, prompt and parameters."""
+        payload = json.dumps(
+            {"m": models, "p": prompt, "k": kwargs},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Return the cached response for key if present and fresh."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        response, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return response
+    
+    def set(self, key: str, response: LLMResponse):
+        """Cache a response, evicting the least recently used if full."""
+        self._entries[key] = (response, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
 class LLMInterface:
     """Provider-agnostic interface with automatic fallback.
     
@@ -138,16 +389,32 @@ class LLMInterface:
     - Try providers in order of capability/cost
     - Automatic fallback on failure
     - Circuit breakers to prevent cascading failures
+    - Exact-match response cache for deterministic prompts
+    - Hedged async requests: a slow provider doesn't hold up the fallback
     - Comprehensive metrics for monitoring
     """
     
-    def __init__(self, provider_configs: List[ProviderConfig]):
+    def __init__(
+        self,
+        provider_configs: List[ProviderConfig],
+        max_concurrency: int = 10,
+        response_cache: Optional[ResponseCache] = None,
+        hedge_delay_ms: Optional[float] = None
+    ):
         self.providers = [LLMProvider(config) for config in provider_configs]
+        self.max_concurrency = max_concurrency  # In-flight requests per abatch()
+        self.response_cache = response_cache or ResponseCache()
+        # acomplete() starts the next provider if no answer arrives within
+        # this delay (None = sequential fallback). Set near the primary's
+        # p95 latency: lower hedges more often and pays for duplicate calls.
+        self.hedge_delay_ms = hedge_delay_ms
         self._metrics = {
             "total_requests": 0,
             "total_cost": 0.0,
             "provider_usage": {},
-            "fallback_count": 0
+            "fallback_count": 0,
+            "cache_hits": 0,
+            "hedged_requests": 0  # Requests that started at least one hedge
         }
     
     def complete(self, prompt: str, **kwargs) -> LLMResponse:
@@ -156,36 +423,253 @@ class LLMInterface:
         Tries providers in order until one succeeds.
         """
         self._metrics["total_requests"] += 1
+        cache_key, cached = self._check_cache(prompt, kwargs)
+        if cached is not None:
+            return cached
+        
         last_error = None
         
         for i, provider in enumerate(self.providers):
             try:
                 print(f"Attempting {provider.config.provider.value}...")
                 response = provider.complete(prompt, **kwargs)
+                self._record_success(i, provider, response, cache_key)
+                return response
+                
+            except Exception as e:
+                last_error = e
+                print(f"✗ {provider.config.provider.value} failed: {e}")
+                
+                if i < len(self.providers) - 1:
+                    print(f"  Falling back to next provider...")
+                continue
+        
+        # All providers failed
+        raise Exception(f"All providers failed. Last error: {last_error}")
+    
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream a completion with fallback.
+        
+        Falls back only until the first chunk is delivered; after that a
+        failure is raised to the caller, since a different provider would
+        restart the answer mid-stream.
+        """
+        self._metrics["total_requests"] += 1
+        last_error = None
+        
+        for i, provider in enumerate(self.providers):
+            started = False
+            try:
+                print(f"Streaming from {provider.config.provider.value}...")
+                for chunk in provider.stream(prompt, **kwargs):
+                    started = True
+                    yield chunk
                 
-                # Track metrics
                 provider_name = provider.config.provider.value
                 self._metrics["provider_usage"][provider_name] = \
                     self._metrics["provider_usage"].get(provider_name, 0) + 1
-                self._metrics["total_cost"] += response.cost_usd
-                
                 if i > 0:
                     self._metrics["fallback_count"] += 1
-                    print(f"✓ Fallback successful to {provider_name}")
-                
+                return
+            
+            except Exception as e:
+                if started:
+                    raise
+                last_error = e
+                print(f"✗ {provider.config.provider.value} failed: {e}")
+                continue
+        
+        # All providers failed
+        raise Exception(f"All providers failed. Last error: {last_error}")
+    
+    async def acomplete(self, prompt: str, **kwargs) -> LLMResponse:
+        """Async complete(): same fallback chain, without blocking the loop.
+        
+        With hedge_delay_ms set, the chain is raced instead (see _ahedged).
+        """
+        self._metrics["total_requests"] += 1
+        cache_key, cached = self._check_cache(prompt, kwargs)
+        if cached is not None:
+            return cached
+        
+        if self.hedge_delay_ms is not None:
+            return await self._ahedged(prompt, cache_key, kwargs)
+        
+        last_error = None
+        
+        for i, provider in enumerate(self.providers):
+            try:
+                response = await provider.acomplete(prompt, **kwargs)
+                self._record_success(i, provider, response, cache_key)
                 return response
                 
             except Exception as e:
                 last_error = e
                 print(f"✗ {provider.config.provider.value} failed: {e}")
-                
-                if i < len(self.providers) - 1:
-                    print(f"  Falling back to next provider...")
                 continue
         
         # All providers failed
         raise Exception(f"All providers failed. Last error: {last_error}")
     
+    async def _ahedged(
+        self,
+        prompt: str,
+        cache_key: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """Hedged fallback: race providers instead of waiting out timeouts.
+        
+        Starts the first provider; if it hasn't answered after
+        hedge_delay_ms, starts the next one alongside it. A failure starts
+        the next provider immediately. The first success wins and the
+        others are cancelled (cancellation doesn't count against their
+        circuit breakers). Providers with an open breaker are skipped,
+        checked only when their turn comes: can_attempt() may half-open a
+        breaker, which must not happen for providers never tried.
+        
+        Tail latency drops from timeout + fallback latency to roughly the
+        fallback latency, at the price of occasional duplicate calls.
+        """
+        untried = deque(enumerate(self.providers))
+        hedged = False
+        hedge_delay = self.hedge_delay_ms / 1000
+        attempts: List[Dict[str, Any]] = []
+        in_flight: Dict[asyncio.Task, Tuple[int, LLMProvider, float]] = {}
+        last_error = None
+        
+        def attempt(provider: LLMProvider, start: float, status: str):
+            attempts.append({
+                "provider": provider.config.provider.value,
+                "model": provider.config.model,
+                "latency_ms": (time.perf_counter() - start) * 1000,
+                "status": status
+            })
+        
+        def launch_next() -> bool:
+            """Start the next provider whose breaker allows it, if any."""
+            while untried:
+                i, provider = untried.popleft()
+                if provider.circuit_breaker.can_attempt():
+                    task = asyncio.ensure_future(provider.acomplete(prompt, **kwargs))
+                    in_flight[task] = (i, provider, time.perf_counter())
+                    return True
+            return False
+        
+        launch_next()
+        
+        while in_flight:
+            done, _ = await asyncio.wait(
+                in_flight,
+                timeout=hedge_delay if untried else None,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            
+            if not done:
+                # Slow answer: hedge with the next provider
+                if launch_next() and not hedged:
+                    hedged = True
+                    self._metrics["hedged_requests"] += 1
+                continue
+            
+            # Settle every finished task before returning a winner: a
+            # failure finishing alongside it must still be recorded (and
+            # its exception retrieved), not reported as cancelled
+            winner = None
+            for task in done:
+                i, provider, start = in_flight.pop(task)
+                if task.exception() is None:
+                    if winner is None:
+                        winner = (task, i, provider)
+                    attempt(provider, start, "ok")
+                    continue
+                
+                last_error = task.exception()
+                attempt(provider, start, "error")
+                print(f"✗ {provider.config.provider.value} failed: {last_error}")
+            
+            if winner is not None:
+                task, i, provider = winner
+                for loser, (_, other, other_start) in in_flight.items():
+                    loser.cancel()
+                    attempt(other, other_start, "cancelled")
+                
+                response = replace(task.result(), attempts=attempts)
+                self._record_success(i, provider, response, cache_key)
+                return response
+            
+            # Failed outright: move on without waiting for the hedge delay
+            launch_next()
+        
+        # All providers failed or were skipped
+        raise Exception(f"All providers failed. Last error: {last_error}")
+    
+    async def abatch(
+        self,
+        prompts: List[str],
+        **kwargs
+    ) -> List[Union[LLMResponse, Exception]]:
+        """Complete many independent prompts concurrently.
+        
+        I/O-bound calls overlap, so N prompts take ~max(latency) rather than
+        sum(latency); at most max_concurrency are in flight to respect
+        provider rate limits. Results keep prompt order; a prompt whose
+        whole fallback chain failed yields its exception instead of
+        discarding the other results.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def call_one(prompt: str) -> LLMResponse:
+            async with semaphore:
+                return await self.acomplete(prompt, **kwargs)
+        
+        return await asyncio.gather(
+            *[call_one(prompt) for prompt in prompts],
+            return_exceptions=True
+        )
+    
+    def _check_cache(
+        self,
+        prompt: str,
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[LLMResponse]]:
+        """Return (cache key, cached response) for a request.
+        
+        The key is None for sampled requests (temperature > 0), which are
+        never cached. Requests without a temperature are treated as
+        deterministic. Hits are returned at zero cost and latency.
+        """
+        if kwargs.get("temperature", 0) > 0:
+            return None, None
+        
+        models = [provider.config.model for provider in self.providers]
+        key = ResponseCache.make_key(models, prompt, kwargs)
+        cached = self.response_cache.get(key)
+        if cached is None:
+            return key, None
+        
+        self._metrics["cache_hits"] += 1
+        return key, replace(cached, cost_usd=0.0, latency_ms=0.0, attempts=[])
+    
+    def _record_success(
+        self,
+        index: int,
+        provider: LLMProvider,
+        response: LLMResponse,
+        cache_key: Optional[str] = None
+    ):
+        """Track metrics for a successful provider call and cache it."""
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+        
+        provider_name = provider.config.provider.value
+        self._metrics["provider_usage"][provider_name] = \
+            self._metrics["provider_usage"].get(provider_name, 0) + 1
+        self._metrics["total_cost"] += response.cost_usd
+        
+        if index > 0:
+            self._metrics["fallback_count"] += 1
+            print(f"✓ Fallback successful to {provider_name}")
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get usage metrics for monitoring."""
         return self._metrics.copy()
@@ -230,6 +714,48 @@ def main():
     except Exception as e:
         print(f"\n✗ All providers failed: {e}")
     
+    # Identical deterministic prompt: served from the response cache
+    print("\nRepeating request...")
+    try:
+        response = interface.complete(prompt)
+        print(f"  Cost: ${response.cost_usd:.6f} (cache hits: {interface.get_metrics()['cache_hits']})")
+    except Exception as e:
+        print(f"\n✗ All providers failed: {e}")
+    
+    # Independent prompts run concurrently (bounded by max_concurrency)
+    prompts = [f"Summarize support ticket #{n}" for n in range(5)]
+    print(f"\nBatch of {len(prompts)} prompts (async)...")
+    start = time.monotonic()
+    responses = asyncio.run(interface.abatch(prompts))
+    succeeded = sum(1 for r in responses if isinstance(r, LLMResponse))
+    print(f"  {succeeded}/{len(prompts)} succeeded in {time.monotonic() - start:.2f}s")
+    
+    # Streaming: first text after ~one round trip, flushed in batches
+    print("\nStreaming request...")
+    try:
+        start = time.monotonic()
+        first_chunk_s = None
+        chunks = 0
+        for chunk in interface.stream("Write a short poem about retries."):
+            if first_chunk_s is None:
+                first_chunk_s = time.monotonic() - start
+            chunks += 1
+        print(f"  {chunks} chunks, first after {first_chunk_s:.2f}s, "
+              f"done after {time.monotonic() - start:.2f}s")
+    except Exception as e:
+        print(f"\n✗ All providers failed: {e}")
+    
+    # Hedging: if the primary is slower than 50ms, race the next provider
+    print("\nHedged request (hedge after 50ms)...")
+    hedged = LLMInterface(configs, hedge_delay_ms=50)
+    try:
+        response = asyncio.run(hedged.acomplete("What is a hedged request?"))
+        print(f"  Winner: {response.model}")
+        for a in response.attempts:
+            print(f"    {a['model']:15s} {a['status']:9s} {a['latency_ms']:.0f}ms")
+    except Exception as e:
+        print(f"\n✗ All providers failed: {e}")
+    
     print("\n" + "="*50)
     print("\nMetrics:")
     metrics = interface.get_metrics()
@@ -243,6 +769,11 @@ def main():
     print("3. Use circuit breakers to prevent cascading failures")
     print("4. Track metrics for cost optimization and monitoring")
     print("5. Design fallback chain: expensive/capable → cheap/basic")
+    print("6. Issue independent requests concurrently with a concurrency cap")
+    print("7. Cache deterministic responses; never pay twice for the same prompt")
+    print("8. Put static prompt parts first so providers can cache the prefix")
+    print("9. Hedge slow requests to cut tail latency; cancel the losers")
+    print("10. Stream responses in batched chunks to cut time-to-first-token")
 
 
 if __name__ == "__main__":
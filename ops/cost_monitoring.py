@@ -12,8 +12,14 @@ Key Production Concerns:
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime, timedelta
-import statistics
+from datetime import date, datetime, timedelta
+import sys
+
+import numpy as np
+
+
+# slots=True needs Python 3.10+; on 3.9 these stay regular dataclasses
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class CostComponent(Enum):
@@ -24,9 +30,9 @@ class CostComponent(Enum):
     COMPUTE = "compute"
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class CostRecord:
-    """Record of a cost-incurring operation."""
+    """Record of a cost-incurring operation (immutable once recorded)."""
     timestamp: datetime
     user_id: str
     component: CostComponent
@@ -42,11 +48,33 @@ class CostTracker:
     - Track costs per request for granular analysis
     - Aggregate by user, component, time period
     - Alert when budgets are at risk
+    - Columnar storage: aggregations are vectorized NumPy passes, not
+      Python loops over record objects
     """
     
-    def __init__(self):
-        self._records: List[CostRecord] = []
+    _COMPONENTS = list(CostComponent)
+    _COMPONENT_CODES = {component: code for code, component in enumerate(_COMPONENTS)}
+    
+    def __init__(self, initial_capacity: int = 1024):
         self._user_budgets: Dict[str, float] = {}  # user_id -> daily budget
+        
+        # One array per field (struct-of-arrays), grown by doubling.
+        # Rows are in insertion order, so _ts is sorted.
+        self._n = 0
+        self._ts = np.empty(initial_capacity, dtype=np.int64)  # epoch microseconds
+        self._user_ids = np.empty(initial_capacity, dtype=np.int32)
+        self._components = np.empty(initial_capacity, dtype=np.int8)
+        self._amounts = np.empty(initial_capacity, dtype=np.float64)
+        self._tokens = np.empty(initial_capacity, dtype=np.int64)
+        self._metadata: List[Optional[Dict]] = []
+        
+        # Interned user ids: string <-> dense int code
+        self._user_codes: Dict[str, int] = {}
+        self._user_names: List[str] = []
+        
+        # Running spend per user for the current day, for O(1) budget checks
+        self._today_date: Optional[date] = None
+        self._today_totals: Dict[str, float] = {}
     
     def record_cost(
         self,
@@ -60,19 +88,96 @@ class CostTracker:
         
         Production: Send to time series database (Prometheus, CloudWatch, etc.).
         """
-        record = CostRecord(
-            timestamp=datetime.now(),
-            user_id=user_id,
-            component=component,
-            amount_usd=amount_usd,
-            tokens_used=tokens_used,
-            metadata=metadata or {}
-        )
-        self._records.append(record)
+        now = datetime.now()
+        ts = self._next_timestamp(now)
+        
+        if self._n == len(self._amounts):
+            self._grow(self._n + 1)
+        
+        row = self._n
+        self._ts[row] = ts
+        self._user_ids[row] = self._intern_user(user_id)
+        self._components[row] = self._COMPONENT_CODES[component]
+        self._amounts[row] = amount_usd
+        self._tokens[row] = tokens_used
+        self._metadata.append(metadata or None)
+        self._n += 1
+        
+        self._roll_today(now)
+        self._today_totals[user_id] = self._today_totals.get(user_id, 0.0) + amount_usd
         
         # Check if user is approaching budget
         self._check_user_budget(user_id)
     
+    def record_cost_many(
+        self,
+        user_ids: List[str],
+        components: List[CostComponent],
+        amounts_usd,
+        tokens_used=None
+    ):
+        """Record a batch of operations with one timestamp.
+        
+        One clock read, one slice write per column, and one budget check per
+        distinct user instead of per record. Use from high-QPS paths that
+        buffer costs and flush periodically.
+        """
+        count = len(user_ids)
+        amounts = np.asarray(amounts_usd, dtype=np.float64)
+        tokens = np.zeros(count, dtype=np.int64) if tokens_used is None \
+            else np.asarray(tokens_used, dtype=np.int64)
+        if not (len(components) == len(amounts) == len(tokens) == count):
+            raise ValueError("user_ids, components, amounts_usd and tokens_used must have equal length")
+        if count == 0:
+            return
+        
+        now = datetime.now()
+        ts = self._next_timestamp(now)
+        
+        # Intern each distinct user once; inverse maps rows to them
+        unique_users, inverse = np.unique(np.asarray(user_ids, dtype=str), return_inverse=True)
+        users = unique_users.tolist()
+        codes = np.array([self._intern_user(user) for user in users], dtype=np.int32)
+        
+        if self._n + count > len(self._amounts):
+            self._grow(self._n + count)
+        
+        rows = slice(self._n, self._n + count)
+        self._ts[rows] = ts
+        self._user_ids[rows] = codes[inverse]
+        self._components[rows] = [self._COMPONENT_CODES[c] for c in components]
+        self._amounts[rows] = amounts
+        self._tokens[rows] = tokens
+        self._metadata.extend([None] * count)
+        self._n += count
+        
+        # Per-user batch totals in one pass, then one budget check per user
+        self._roll_today(now)
+        batch_totals = np.bincount(inverse.ravel(), weights=amounts, minlength=len(users))
+        for user, total in zip(users, batch_totals.tolist()):
+            self._today_totals[user] = self._today_totals.get(user, 0.0) + total
+            self._check_user_budget(user)
+    
+    def get_records(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        component: Optional[CostComponent] = None
+    ) -> List[CostRecord]:
+        """Materialize matching rows as CostRecord objects (for export/debugging)."""
+        return [
+            CostRecord(
+                timestamp=_from_micros(int(self._ts[i])),
+                user_id=self._user_names[self._user_ids[i]],
+                component=self._COMPONENTS[self._components[i]],
+                amount_usd=float(self._amounts[i]),
+                tokens_used=int(self._tokens[i]),
+                metadata=self._metadata[i] or {}
+            )
+            for i in self._filter_rows(start_time, end_time, user_id, component)
+        ]
+    
     def get_total_cost(
         self,
         start_time: Optional[datetime] = None,
@@ -81,8 +186,8 @@ class CostTracker:
         component: Optional[CostComponent] = None
     ) -> float:
         """Get total cost with optional filters."""
-        filtered = self._filter_records(start_time, end_time, user_id, component)
-        return sum(r.amount_usd for r in filtered)
+        rows = self._filter_rows(start_time, end_time, user_id, component)
+        return float(self._amounts[rows].sum())
     
     def get_cost_breakdown(
         self,
@@ -90,17 +195,17 @@ class CostTracker:
         end_time: Optional[datetime] = None
     ) -> Dict[str, float]:
         """Get cost breakdown by component."""
-        filtered = self._filter_records(start_time, end_time)
-        
-        breakdown = {}
-        for component in CostComponent:
-            component_cost = sum(
-                r.amount_usd for r in filtered 
-                if r.component == component
-            )
-            breakdown[component.value] = component_cost
+        rows = self._filter_rows(start_time, end_time)
         
-        return breakdown
+        totals = np.bincount(
+            self._components[rows],
+            weights=self._amounts[rows],
+            minlength=len(self._COMPONENTS)
+        )
+        return {
+            component.value: float(totals[code])
+            for code, component in enumerate(self._COMPONENTS)
+        }
     
     def get_top_users(
         self,
@@ -109,30 +214,35 @@ class CostTracker:
         end_time: Optional[datetime] = None
     ) -> List[tuple]:
         """Get top users by cost."""
-        filtered = self._filter_records(start_time, end_time)
+        rows = self._filter_rows(start_time, end_time)
+        if limit <= 0 or not len(rows):
+            return []
         
-        user_costs = {}
-        for record in filtered:
-            user_costs[record.user_id] = \
-                user_costs.get(record.user_id, 0) + record.amount_usd
+        users = self._user_ids[rows]
+        totals = np.bincount(users, weights=self._amounts[rows], minlength=len(self._user_names))
+        active = np.flatnonzero(np.bincount(users, minlength=len(self._user_names)))
         
-        sorted_users = sorted(
-            user_costs.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        # Partial selection of the top `limit`, then sort only those
+        if limit < len(active):
+            active = active[np.argpartition(-totals[active], limit - 1)[:limit]]
+        top = active[np.argsort(-totals[active], kind="stable")]
         
-        return sorted_users[:limit]
+        return [(self._user_names[code], float(totals[code])) for code in top]
     
     def get_cost_stats(
         self,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None
     ) -> Dict:
-        """Get statistical summary of costs."""
-        filtered = self._filter_records(start_time, end_time)
+        """Get statistical summary of costs.
         
-        if not filtered:
+        Exact, computed on read: the amounts already sit in one column, so
+        a single np.partition (O(n), in C) finds the order statistics and
+        recording stays free of per-record bookkeeping.
+        """
+        rows = self._filter_rows(start_time, end_time)
+        
+        if not len(rows):
             return {
                 "total": 0,
                 "mean": 0,
@@ -142,17 +252,23 @@ class CostTracker:
                 "count": 0
             }
         
-        costs = [r.amount_usd for r in filtered]
-        sorted_costs = sorted(costs)
-        p95_idx = int(len(sorted_costs) * 0.95)
+        # Time-only filters select a contiguous run: slice a view instead
+        # of gathering a copy (np.partition makes the one copy needed)
+        costs = self._amounts[rows[0]:rows[-1] + 1]
+        n = len(costs)
+        p95_idx = min(int(n * 0.95), n - 1)
+        
+        # One O(n) partition places the median and p95 order statistics
+        kth = sorted({(n - 1) // 2, n // 2, p95_idx})
+        partitioned = np.partition(costs, kth)
         
         return {
-            "total": sum(costs),
-            "mean": statistics.mean(costs),
-            "median": statistics.median(costs),
-            "p95": sorted_costs[p95_idx] if p95_idx < len(sorted_costs) else sorted_costs[-1],
-            "max": max(costs),
-            "count": len(costs)
+            "total": float(costs.sum()),
+            "mean": float(costs.mean()),
+            "median": float((partitioned[(n - 1) // 2] + partitioned[n // 2]) / 2),
+            "p95": float(partitioned[p95_idx]),
+            "max": float(costs.max()),
+            "count": n
         }
     
     def set_user_budget(self, user_id: str, daily_budget_usd: float):
@@ -160,17 +276,15 @@ class CostTracker:
         self._user_budgets[user_id] = daily_budget_usd
     
     def _check_user_budget(self, user_id: str):
-        """Check if user is approaching or exceeding budget."""
+        """Check if user is approaching or exceeding budget.
+        
+        Reads the running daily total: O(1), no scan of today's records.
+        """
         if user_id not in self._user_budgets:
             return
         
         budget = self._user_budgets[user_id]
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        user_cost_today = self.get_total_cost(
-            start_time=today_start,
-            user_id=user_id
-        )
+        user_cost_today = self._today_totals.get(user_id, 0.0)
         
         usage_percent = (user_cost_today / budget) * 100
         
@@ -181,29 +295,85 @@ class CostTracker:
             print(f"⚠️  WARNING: User {user_id} at {usage_percent:.0f}% of daily budget")
             print(f"   Used: ${user_cost_today:.2f} / ${budget:.2f}")
     
-    def _filter_records(
+    def _filter_rows(
         self,
         start_time: Optional[datetime],
         end_time: Optional[datetime],
         user_id: Optional[str] = None,
         component: Optional[CostComponent] = None
-    ) -> List[CostRecord]:
-        """Filter records by criteria."""
-        filtered = self._records
+    ) -> np.ndarray:
+        """Return indices of rows matching the criteria.
         
-        if start_time:
-            filtered = [r for r in filtered if r.timestamp >= start_time]
+        Time bounds are binary searches over the sorted timestamp column;
+        user and component filters are vectorized equality masks over
+        that window only.
+        """
+        ts = self._ts[:self._n]
+        lo = int(np.searchsorted(ts, _to_micros(start_time), "left")) if start_time else 0
+        hi = int(np.searchsorted(ts, _to_micros(end_time), "right")) if end_time else self._n
         
-        if end_time:
-            filtered = [r for r in filtered if r.timestamp <= end_time]
+        if not user_id and not component:
+            return np.arange(lo, hi)
         
+        mask = np.ones(max(hi - lo, 0), dtype=bool)
         if user_id:
-            filtered = [r for r in filtered if r.user_id == user_id]
-        
+            code = self._user_codes.get(user_id)
+            if code is None:
+                return np.arange(0)
+            mask &= self._user_ids[lo:hi] == code
         if component:
-            filtered = [r for r in filtered if r.component == component]
+            mask &= self._components[lo:hi] == self._COMPONENT_CODES[component]
+        
+        return lo + np.flatnonzero(mask)
+    
+    def _next_timestamp(self, now: datetime) -> int:
+        """Epoch microseconds for a new row, never before the previous row.
+        
+        The wall clock can step backwards (NTP); clamping keeps _ts sorted.
+        """
+        ts = _to_micros(now)
+        if self._n and ts < self._ts[self._n - 1]:
+            return int(self._ts[self._n - 1])
+        return ts
+    
+    def _roll_today(self, now: datetime):
+        """Reset daily totals lazily at the first record of a new day."""
+        today = now.date()
+        if today != self._today_date:
+            self._today_totals.clear()
+            self._today_date = today
+    
+    def _intern_user(self, user_id: str) -> int:
+        """Map a user id to its dense integer code, assigning one if new."""
+        code = self._user_codes.get(user_id)
+        if code is None:
+            code = len(self._user_names)
+            self._user_codes[user_id] = code
+            self._user_names.append(user_id)
+        return code
+    
+    def _grow(self, min_capacity: int):
+        """Grow every column geometrically to hold at least min_capacity rows."""
+        capacity = max(len(self._amounts), 1)
+        while capacity < min_capacity:
+            capacity *= 2
         
-        return filtered
+        for name in ("_ts", "_user_ids", "_components", "_amounts", "_tokens"):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:self._n] = old[:self._n]
+            setattr(self, name, grown)
+
+
+def _to_micros(timestamp: datetime) -> int:
+    """Datetime to integer epoch microseconds (exact, unlike float seconds)."""
+    return round(timestamp.timestamp() * 1_000_000)
+
+
+def _from_micros(micros: int) -> datetime:
+    """Inverse of _to_micros (naive local time)."""
+    seconds, remainder = divmod(micros, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder)
 
 
 def simulate_usage(tracker: CostTracker):
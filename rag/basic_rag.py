@@ -9,12 +9,49 @@ Key Production Concerns:
 3. No results handling: Never hallucinate, admit uncertainty
 """
 
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Mapping, Optional, Tuple
 from dataclasses import dataclass
+import asyncio
+import copy
+import functools
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
+import re
+import sys
 
+import numpy as np
 
-@dataclass
+try:
+    import tiktoken  # Optional: pip install -e ".[rag]"
+except ImportError:
+    tiktoken = None
+
+
+EMBEDDING_DIM = 1536  # OpenAI ada-002 dimension
+
+_WORD_RE = re.compile(r"\S+")
+
+# slots=True needs Python 3.10+; on 3.9 these stay regular dataclasses
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoder():
+    """Return the shared cl100k_base encoder, or None if unavailable.
+    
+    Loaded lazily once per process; falls back to word chunking if tiktoken
+    is missing or its vocabulary can't be loaded.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"WARNING: tiktoken encoder unavailable, chunking by words: {e}")
+        return None
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Document:
     """A document to be indexed."""
     id: str
@@ -26,14 +63,29 @@ class Document:
             self.metadata = {}
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Chunk:
-    """A chunk of a document with context."""
+    """A chunk of a document with context.
+    
+    All chunks of a document share one copy of its metadata (treat
+    base_metadata as read-only); the merged per-chunk dict is only built
+    when `metadata` is read.
+    """
     id: str
     content: str
     doc_id: str
     start_pos: int
-    metadata: Dict
+    base_metadata: Mapping
+    chunk_index: int
+    total_chunks: int
+    
+    @property
+    def metadata(self) -> Dict:
+        return {
+            **self.base_metadata,
+            "chunk_index": self.chunk_index,
+            "total_chunks": self.total_chunks
+        }
 
 
 class DocumentChunker:
@@ -59,68 +111,207 @@ class DocumentChunker:
             List of chunks with overlap
             
         Production Notes:
-        - Use tiktoken for accurate token counting (rough approximation here)
+        - Sizes are in tokens with tiktoken, words without it
         - Consider semantic chunking (by paragraph/section) for some domains
         - Include source attribution in metadata for citations
         """
-        # Simple word-based chunking (production: use tiktoken)
-        words = doc.content.split()
-        chunks = []
-        
-        for i in range(0, len(words), self.chunk_size - self.overlap):
-            chunk_words = words[i:i + self.chunk_size]
-            chunk_content = " ".join(chunk_words)
+        # Tokenize once; each chunk is then one slice, not a re-join
+        encoder = _get_encoder()
+        if encoder is not None:
+            tokens = encoder.encode(doc.content, disallowed_special=())
+            num_units = len(tokens)
+            
+            def chunk_text(start: int, end: int) -> str:
+                return encoder.decode(tokens[start:end])
+        else:
+            # Character offsets of each word: a chunk is content[first:last]
+            spans = [m.span() for m in _WORD_RE.finditer(doc.content)]
+            num_units = len(spans)
             
-            chunk_id = f"{doc.id}_chunk_{len(chunks)}"
-            chunk = Chunk(
-                id=chunk_id,
-                content=chunk_content,
+            def chunk_text(start: int, end: int) -> str:
+                return doc.content[spans[start][0]:spans[end - 1][1]]
+        
+        # A window starting at or after num_units - overlap would lie
+        # entirely inside the previous one, so stop before it
+        stride = self.chunk_size - self.overlap
+        starts = range(0, max(num_units - self.overlap, 1), stride) if num_units else range(0)
+        total = len(starts)
+        
+        # Copied once per document, shared by all its chunks. A plain dict
+        # (not a MappingProxyType) so chunks pickle for parallel chunking;
+        # pickle keeps the sharing within one document's chunk list.
+        base_metadata = dict(doc.metadata)
+        
+        return [
+            Chunk(
+                id=f"{doc.id}_chunk_{index}",
+                content=chunk_text(i, min(i + self.chunk_size, num_units)),
                 doc_id=doc.id,
                 start_pos=i,
-                metadata={
-                    **doc.metadata,
-                    "chunk_index": len(chunks),
-                    "total_chunks": 0  # Will be set below
-                }
+                base_metadata=base_metadata,
+                chunk_index=index,
+                total_chunks=total
             )
-            chunks.append(chunk)
-        
-        # Update total chunks count after all chunks are created
-        total = len(chunks)
-        for chunk in chunks:
-            chunk.metadata["total_chunks"] = total
-        
-        return chunks
+            for index, i in enumerate(starts)
+        ]
 
 
 class VectorStore:
     """Simple in-memory vector store.
     
+    Embeddings are L2-normalized on insert and kept as rows of one matrix
+    (ids and metadata in parallel lists), so search is a BLAS matrix-vector
+    product plus a partial sort instead of a Python scan.
+    
+    Storage dtype trades memory for precision (1536-d vector):
+    - "float32": 6KB, exact
+    - "float16": 3KB, ~1e-3 score error
+    - "int8": 1.5KB + per-row scale, ~1e-2 score error
+    
+    The scan is memory-bound, so smaller rows are proportionally faster.
+    
+    Entries (chunk id + metadata) point at matrix rows, so chunks with
+    identical content can share one stored vector (see add_references).
+    
     In production: Use Pinecone, Weaviate, Qdrant, or similar.
     """
     
-    def __init__(self):
-        self._vectors: List[Tuple[str, List[float], Dict]] = []
+    _DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+    # Rows dequantized per step: keeps the float32 temporary cache-resident
+    _SCAN_BLOCK_ROWS = 4096
     
-    def add(self, chunk_id: str, embedding: List[float], metadata: Dict):
+    def __init__(
+        self,
+        dim: int = EMBEDDING_DIM,
+        initial_capacity: int = 1024,
+        dtype: str = "float32"
+    ):
+        if dtype not in self._DTYPES:
+            raise ValueError(f"dtype must be one of {list(self._DTYPES)}, got {dtype!r}")
+        self.dim = dim
+        self.dtype = dtype
+        self._mat = np.empty((initial_capacity, dim), dtype=self._DTYPES[dtype])
+        # int8 only: row i dequantizes as _mat[i] * _scales[i]
+        self._scales = np.ones(initial_capacity, dtype=np.float32)
+        self._n = 0  # Rows in use
+        # Entries: parallel lists plus the row each one scores with
+        self._ids: List[str] = []
+        self._meta: List[Dict] = []
+        self._entry_rows = np.empty(initial_capacity, dtype=np.int64)
+        self._row_of: Dict[str, int] = {}  # chunk_id -> row
+    
+    def add(self, chunk_id: str, embedding, metadata: Dict):
         """Add a chunk embedding to the store."""
-        self._vectors.append((chunk_id, embedding, metadata))
+        self.add_batch([chunk_id], np.asarray(embedding, dtype=np.float32)[None, :], [metadata])
+    
+    def add_batch(self, chunk_ids: List[str], embeddings: np.ndarray, metadatas: List[Dict]):
+        """Add many chunk embeddings with one slice write.
+        
+        Normalization and quantization run once over the whole (n, dim)
+        block instead of once per row.
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        count = len(chunk_ids)
+        if vectors.shape != (count, self.dim) or len(metadatas) != count:
+            raise ValueError(
+                f"Expected {count} embeddings of dim {self.dim} and {count} metadata dicts, "
+                f"got {vectors.shape} and {len(metadatas)}"
+            )
+        if count == 0:
+            return
+        
+        while self._n + count > len(self._mat):
+            self._grow()
+        
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+        
+        rows = slice(self._n, self._n + count)
+        if self.dtype == "int8":
+            peaks = np.abs(vectors).max(axis=1)
+            scales = np.where(peaks > 0, peaks / 127.0, 1.0).astype(np.float32)
+            self._mat[rows] = np.rint(vectors / scales[:, None])
+            self._scales[rows] = scales
+        else:
+            self._mat[rows] = vectors
+        
+        self._append_entries(chunk_ids, np.arange(self._n, self._n + count), metadatas)
+        self._n += count
     
-    def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict]:
-        """Search for similar chunks.
+    def add_references(self, chunk_ids: List[str], source_ids: List[str], metadatas: List[Dict]):
+        """Add entries that reuse the stored vectors of existing chunks.
         
-        In production: Use proper vector similarity (cosine, dot product).
-        This is a mock implementation.
+        For duplicate content: no embedding, no new matrix row; each new
+        entry scores with its source chunk's row.
         """
-        # Mock: Return first top_k items
-        results = []
-        for chunk_id, embedding, metadata in self._vectors[:top_k]:
-            results.append({
-                "chunk_id": chunk_id,
-                "score": 0.95,  # Mock score
-                "metadata": metadata
-            })
-        return results
+        rows = np.array([self._row_of[source] for source in source_ids], dtype=np.int64)
+        self._append_entries(chunk_ids, rows, metadatas)
+    
+    def _append_entries(self, chunk_ids: List[str], rows: np.ndarray, metadatas: List[Dict]):
+        """Record entries pointing at the given rows."""
+        start, end = len(self._ids), len(self._ids) + len(chunk_ids)
+        if end > len(self._entry_rows):
+            grown = np.empty(max(end, 2 * len(self._entry_rows)), dtype=np.int64)
+            grown[:start] = self._entry_rows[:start]
+            self._entry_rows = grown
+        
+        self._entry_rows[start:end] = rows
+        self._row_of.update(zip(chunk_ids, rows.tolist()))
+        self._ids.extend(chunk_ids)
+        self._meta.extend(metadatas)
+    
+    def search(self, query_embedding, top_k: int = 5) -> List[Dict]:
+        """Search for the most similar chunks by cosine similarity."""
+        if self._n == 0 or top_k <= 0:
+            return []
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        
+        # Score each stored vector once, then fan out to the entries using it
+        scores = self._scores(query)[self._entry_rows[:len(self._ids)]]
+        
+        # O(n) selection of the top k, then sort only those k
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        
+        return [
+            {
+                "chunk_id": self._ids[i],
+                "score": float(scores[i]),
+                "metadata": self._meta[i]
+            }
+            for i in top
+        ]
+    
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        """Dot products of every stored row with a normalized query."""
+        if self.dtype == "float32":
+            return self._mat[:self._n] @ query
+        
+        # Upcast block by block rather than materializing a float32 copy
+        scores = np.empty(self._n, dtype=np.float32)
+        for start in range(0, self._n, self._SCAN_BLOCK_ROWS):
+            end = min(start + self._SCAN_BLOCK_ROWS, self._n)
+            scores[start:end] = self._mat[start:end].astype(np.float32) @ query
+        
+        if self.dtype == "int8":
+            scores *= self._scales[:self._n]
+        return scores
+    
+    def _grow(self):
+        """Double the backing matrix (amortized O(1) inserts)."""
+        capacity = max(2 * len(self._mat), 1)
+        grown = np.empty((capacity, self.dim), dtype=self._mat.dtype)
+        grown[:self._n] = self._mat[:self._n]
+        self._mat = grown
+        
+        scales = np.ones(capacity, dtype=np.float32)
+        scales[:self._n] = self._scales[:self._n]
+        self._scales = scales
 
 
 class BasicRAG:
@@ -131,12 +322,37 @@ class BasicRAG:
     - Embed and store in vector DB
     - Retrieve relevant chunks on query
     - Generate response with LLM
+    - Semantic cache: near-duplicate queries reuse a recent answer
     """
     
-    def __init__(self, chunk_size: int = 500, overlap: int = 50):
+    def __init__(
+        self,
+        chunk_size: int = 500,
+        overlap: int = 50,
+        semantic_cache_threshold: Optional[float] = 0.92,
+        semantic_cache_size: int = 1000,
+        vector_dtype: str = "float32",
+        chunk_workers: int = 1
+    ):
         self.chunker = DocumentChunker(chunk_size, overlap)
-        self.vector_store = VectorStore()
+        # Processes used to chunk large batches (1 = serial). Chunking is
+        # CPU-bound, so threads would serialize on the GIL.
+        self.chunk_workers = chunk_workers
+        self.vector_store = VectorStore(dtype=vector_dtype)
         self._indexed_docs = set()
+        # Content digest -> first chunk id with that content, so repeated
+        # boilerplate (footers, licenses) is embedded and stored only once
+        self._chunk_hash_to_id: Dict[bytes, str] = {}
+        # Cosine similarity above which a previous answer is reused
+        # (None disables the cache). Too low serves wrong answers.
+        self.semantic_cache_threshold = semantic_cache_threshold
+        # Ring buffer of normalized query embeddings, the top_k each was
+        # answered with, and their results
+        self._query_cache_embs = np.zeros((semantic_cache_size, EMBEDDING_DIM), dtype=np.float32)
+        self._query_cache_top_k = np.zeros(semantic_cache_size, dtype=np.int64)
+        self._query_cache_results: List[Optional[Dict]] = [None] * semantic_cache_size
+        self._query_cache_size = 0
+        self._query_cache_next = 0
     
     def index_documents(self, documents: List[Document]):
         """Index documents for retrieval.
@@ -148,29 +364,84 @@ class BasicRAG:
         """
         print(f"Indexing {len(documents)} documents...")
         
+        new_docs = []
         for doc in documents:
             if doc.id in self._indexed_docs:
                 print(f"  Skipping already indexed: {doc.id}")
                 continue
-            
-            # Chunk document
-            chunks = self.chunker.chunk(doc)
-            print(f"  {doc.id}: {len(chunks)} chunks")
-            
-            # Embed and store chunks
-            for chunk in chunks:
-                # Mock embedding (production: use real embedding model)
-                embedding = self._mock_embed(chunk.content)
-                self.vector_store.add(chunk.id, embedding, {
-                    "content": chunk.content,
-                    "doc_id": chunk.doc_id,
-                    **chunk.metadata
-                })
-            
+            new_docs.append(doc)
             self._indexed_docs.add(doc.id)
         
+        # Chunk every new document first...
+        all_chunks: List[Chunk] = []
+        for doc, chunks in zip(new_docs, self._chunk_all(new_docs)):
+            print(f"  {doc.id}: {len(chunks)} chunks")
+            all_chunks.extend(chunks)
+        
+        # ...split off chunks whose exact content is already indexed...
+        unique: List[Chunk] = []
+        duplicates: List[Tuple[Chunk, str]] = []
+        for chunk in all_chunks:
+            digest = hashlib.blake2b(chunk.content.encode(), digest_size=16).digest()
+            source_id = self._chunk_hash_to_id.setdefault(digest, chunk.id)
+            if source_id == chunk.id:
+                unique.append(chunk)
+            else:
+                duplicates.append((chunk, source_id))
+        
+        # ...then embed the unique ones in one batch and bulk-insert, instead
+        # of one embedding round-trip per chunk
+        if unique:
+            embeddings = self._embed_batch([chunk.content for chunk in unique])
+            self.vector_store.add_batch(
+                [chunk.id for chunk in unique],
+                embeddings,
+                [self._chunk_metadata(chunk) for chunk in unique]
+            )
+        
+        # Duplicates stay retrievable (with their own source attribution)
+        # but share the original's vector
+        if duplicates:
+            print(f"  Reusing embeddings for {len(duplicates)} duplicate chunks")
+            self.vector_store.add_references(
+                [chunk.id for chunk, _ in duplicates],
+                [source_id for _, source_id in duplicates],
+                [self._chunk_metadata(chunk) for chunk, _ in duplicates]
+            )
+        
+        # New content can change answers: drop cached query results
+        self._query_cache_size = 0
+        self._query_cache_next = 0
+        
         print(f"Indexed {len(self._indexed_docs)} documents total")
     
+    @staticmethod
+    def _chunk_metadata(chunk: Chunk) -> Dict:
+        """Metadata stored with a chunk in the vector store.
+        
+        Built in one dict straight from the shared fields; going through
+        chunk.metadata would allocate a throwaway merged dict per chunk.
+        """
+        return {
+            "content": chunk.content,
+            "doc_id": chunk.doc_id,
+            **chunk.base_metadata,
+            "chunk_index": chunk.chunk_index,
+            "total_chunks": chunk.total_chunks
+        }
+    
+    def _chunk_all(self, documents: List[Document]) -> List[List[Chunk]]:
+        """Chunk documents, across worker processes when configured.
+        
+        Production: Only worth it for large batches; each document and its
+        chunks are pickled between processes.
+        """
+        if self.chunk_workers <= 1 or len(documents) < 2:
+            return [self.chunker.chunk(doc) for doc in documents]
+        
+        with ProcessPoolExecutor(max_workers=self.chunk_workers) as pool:
+            return list(pool.map(self.chunker.chunk, documents, chunksize=8))
+    
     def query(self, query: str, top_k: int = 5) -> Dict:
         """Query the RAG system.
         
@@ -191,25 +462,92 @@ class BasicRAG:
         # Embed query
         query_embedding = self._mock_embed(query)
         
+        # Paraphrased repeats skip retrieval and generation entirely
+        cached = self._semantic_cache_lookup(query_embedding, top_k)
+        if cached is not None:
+            return cached
+        
+        result = self._answer(query, query_embedding, top_k)
+        self._semantic_cache_store(query_embedding, top_k, result)
+        return result
+    
+    async def aquery(self, query: str, top_k: int = 5) -> Dict:
+        """Async version of query().
+        
+        Embedding and generation are awaited and the search runs in a worker
+        thread, so many queries can overlap their network waits.
+        """
+        print(f"\nQuery: {query}")
+        
+        query_embedding = await self._aembed(query)
+        
+        cached = self._semantic_cache_lookup(query_embedding, top_k)
+        if cached is not None:
+            return cached
+        
+        results = await asyncio.to_thread(self.vector_store.search, query_embedding, top_k)
+        if not results:
+            result = self._no_results()
+        else:
+            response = await self._agenerate_response(query, self._build_context(results))
+            result = self._build_result(results, response)
+        
+        self._semantic_cache_store(query_embedding, top_k, result)
+        return result
+    
+    async def aquery_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        max_concurrency: int = 10
+    ) -> List[Dict]:
+        """Answer many queries concurrently, results in input order.
+        
+        Production: Total latency approaches the slowest query instead of
+        the sum; the semaphore keeps in-flight calls under provider rate limits.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded(query: str) -> Dict:
+            async with semaphore:
+                return await self.aquery(query, top_k)
+        
+        return await asyncio.gather(*(bounded(query) for query in queries))
+    
+    def _answer(self, query: str, query_embedding: np.ndarray, top_k: int) -> Dict:
+        """Retrieve and generate an answer for an embedded query."""
         # Retrieve relevant chunks
         results = self.vector_store.search(query_embedding, top_k)
         
         if not results:
-            return {
-                "response": "I don't have enough information to answer that question.",
-                "chunks": [],
-                "sources": []
-            }
+            return self._no_results()
         
-        # Build context from retrieved chunks
-        context = "\n\n".join([
+        # Generate response (production: use real LLM)
+        response = self._generate_response(query, self._build_context(results))
+        
+        return self._build_result(results, response)
+    
+    @staticmethod
+    def _no_results() -> Dict:
+        """Answer used when retrieval finds nothing: admit it, don't guess."""
+        return {
+            "response": "I don't have enough information to answer that question.",
+            "chunks": [],
+            "sources": [],
+            "num_chunks_used": 0
+        }
+    
+    @staticmethod
+    def _build_context(results: List[Dict]) -> str:
+        """Build numbered context from retrieved chunks."""
+        return "\n\n".join([
             f"[{i+1}] {r['metadata']['content']}"
             for i, r in enumerate(results)
         ])
-        
-        # Generate response (production: use real LLM)
-        response = self._generate_response(query, context)
-        
+    
+    @staticmethod
+    def _build_result(results: List[Dict], response: str) -> Dict:
+        """Assemble the query result with source attribution."""
         # Extract sources for attribution
         sources = list(set([r['metadata']['doc_id'] for r in results]))
         
@@ -220,13 +558,79 @@ class BasicRAG:
             "num_chunks_used": len(results)
         }
     
-    def _mock_embed(self, text: str) -> List[float]:
+    def _semantic_cache_lookup(self, query_embedding: np.ndarray, top_k: int) -> Optional[Dict]:
+        """Return a cached result for a semantically equivalent query.
+        
+        One matrix-vector product scores all cached queries (embeddings are
+        unit-normalized, so dot product = cosine similarity). Only entries
+        answered with the same top_k count. Returns a copy, so callers
+        can't modify the cached result.
+        """
+        if self.semantic_cache_threshold is None or self._query_cache_size == 0:
+            return None
+        
+        n = self._query_cache_size
+        sims = self._query_cache_embs[:n] @ query_embedding
+        sims[self._query_cache_top_k[:n] != top_k] = -np.inf
+        best = int(np.argmax(sims))
+        if sims[best] < self.semantic_cache_threshold:
+            return None
+        
+        print(f"  Semantic cache hit (similarity {sims[best]:.2f})")
+        return copy.deepcopy(self._query_cache_results[best])
+    
+    def _semantic_cache_store(self, query_embedding: np.ndarray, top_k: int, result: Dict):
+        """Remember a copy of a query's result, overwriting the oldest when full."""
+        if self.semantic_cache_threshold is None or not len(self._query_cache_results):
+            return
+        
+        slot = self._query_cache_next
+        self._query_cache_embs[slot] = query_embedding
+        self._query_cache_top_k[slot] = top_k
+        self._query_cache_results[slot] = copy.deepcopy(result)
+        self._query_cache_next = (slot + 1) % len(self._query_cache_results)
+        self._query_cache_size = min(self._query_cache_size + 1, len(self._query_cache_results))
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed many texts, returning an (n, dim) float32 matrix.
+        
+        In production: One embedding API call per provider batch (e.g. 2048
+        inputs for OpenAI); the Batch API is cheaper for offline reindexing.
+        """
+        if not texts:
+            return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        return np.stack([self._mock_embed(text) for text in texts])
+    
+    def _mock_embed(self, text: str) -> np.ndarray:
         """Mock embedding function.
         
+        Deterministic hashed bag-of-words, unit-normalized, so texts with the
+        same words embed identically and similar texts score high. Enough to
+        exercise similarity search and the semantic cache.
+        
         In production: Use OpenAI, Cohere, or local embedding model.
         """
-        # Return mock 1536-dim embedding (OpenAI ada-002 dimension)
-        return [0.1] * 1536
+        embedding = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=4).digest()
+            embedding[int.from_bytes(digest, "little") % EMBEDDING_DIM] += 1.0
+        
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+    
+    async def _aembed(self, text: str) -> np.ndarray:
+        """Async embedding call.
+        
+        In production: await the provider's async client.
+        """
+        return self._mock_embed(text)
+    
+    async def _agenerate_response(self, query: str, context: str) -> str:
+        """Async generation call.
+        
+        In production: await the LLM's async client (e.g. LLMInterface.acomplete).
+        """
+        return self._generate_response(query, context)
     
     def _generate_response(self, query: str, context: str) -> str:
         """Generate response from query and context.
@@ -258,6 +662,12 @@ def main():
             metadata={"source": "support_info.txt", "version": "2024-01"}
         ),
     ]
+    # Same text published twice: embedded once, attributed to both
+    documents.append(Document(
+        id="doc3",
+        content=documents[0].content,
+        metadata={"source": "help_center/refunds.html", "version": "2024-01"}
+    ))
     
     # Initialize RAG system
     rag = BasicRAG(chunk_size=50, overlap=10)  # Small for demo
@@ -269,7 +679,8 @@ def main():
     queries = [
         "What is your refund policy?",
         "How can I contact support?",
-        "Do you offer international shipping?"  # Not in docs
+        "Do you offer international shipping?",  # Not in docs
+        "what is your REFUND policy",  # Same question: semantic cache hit
     ]
     
     for query in queries:
@@ -279,6 +690,13 @@ def main():
         print(f"Chunks used: {result['num_chunks_used']}")
         print("-" * 50)
     
+    # Batch of queries answered concurrently
+    print("\nConcurrent batch:")
+    batch = ["How do I get a refund?", "What are your support hours?"]
+    results = asyncio.run(rag.aquery_many(batch, top_k=3))
+    for query, result in zip(batch, results):
+        print(f"  {query} -> sources {result['sources']}")
+    
     print("\n" + "="*50)
     print("\nKey Takeaways:")
     print("1. Chunk size affects retrieval quality - tune for your use case")
@@ -286,6 +704,8 @@ def main():
     print("3. Handle 'no results' gracefully - never hallucinate")
     print("4. Always provide source attribution for transparency")
     print("5. Monitor: retrieval quality, latency, and cost per query")
+    print("6. Cache answers for paraphrased queries; invalidate on reindex")
+    print("7. Run batch queries concurrently, bounded by a semaphore")
 
 
 if __name__ == "__main__":
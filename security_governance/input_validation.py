@@ -9,10 +9,39 @@ Key Production Concerns:
 3. Quality: Filter out malicious content early
 """
 
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional
 from dataclasses import dataclass
 from enum import Enum
+import functools
 import re
+import sys
+import threading
+
+try:
+    # Optional: pip install -e ".[security_governance]"
+    # RE2 matches in linear time (no backtracking), so crafted input
+    # can't stall the validator (ReDoS).
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+try:
+    import ahocorasick  # Optional: pip install -e ".[security_governance]"
+except ImportError:
+    ahocorasick = None
+
+try:
+    # Optional: pip install -e ".[security_governance]"
+    # Compiles every pattern into one automaton scanned with SIMD.
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+# slots=True needs Python 3.10+; on 3.9 these stay regular dataclasses
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class ValidationResult(Enum):
@@ -24,9 +53,9 @@ class ValidationResult(Enum):
     REJECTED_RATE_LIMIT = "rejected_rate_limit"
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ValidationOutcome:
-    """Outcome of input validation."""
+    """Outcome of input validation (immutable: outcomes are cached and shared)."""
     result: ValidationResult
     message: str
     sanitized_input: str = ""
@@ -45,7 +74,8 @@ class InputValidator:
         self,
         max_length: int = 4000,
         enable_injection_detection: bool = True,
-        enable_content_filtering: bool = True
+        enable_content_filtering: bool = True,
+        outcome_cache_size: int = 4096
     ):
         self.max_length = max_length
         self.enable_injection_detection = enable_injection_detection
@@ -53,15 +83,33 @@ class InputValidator:
         
         # Prompt injection patterns
         # Production: Use more sophisticated detection (ML models)
+        # These run on attacker-controlled text, so they must stay
+        # ReDoS-safe on backtracking engines: no two adjacent quantified
+        # pieces that can match the same characters (e.g. \s+.+\s+ or
+        # \s+a?\s*), and bounded repetition wherever a gap is variable.
+        # A bounded gap of any characters keeps coverage without giving
+        # attackers a word-count or word-length limit to slip past.
         self.injection_patterns = [
             r"ignore\s+(previous|above|prior)\s+instructions",
-            r"disregard\s+.+\s+instructions",
-            r"you\s+are\s+now\s+a?\s*different",
+            r"disregard\s[\s\S]{0,200}?\sinstructions",
+            r"you\s+are\s+now\s+(?:a\s+)?different",
             r"new\s+instructions:",
-            r"system\s*:\s*",
+            r"system\s*:",
             r"developer\s+mode",
             r"admin\s+mode",
         ]
+        # Every injection pattern must contain one of these words as a
+        # required literal. Benign text lacking all of them skips the regex.
+        self.injection_triggers = ("instructions", "different", "system", "mode")
+        # A pattern without a trigger would be silently skipped for all
+        # ASCII input: disable the prefilter rather than miss it
+        untriggered = [
+            p for p in self.injection_patterns
+            if not any(trigger in p.lower() for trigger in self.injection_triggers)
+        ]
+        self._use_injection_prefilter = not untriggered
+        if untriggered:
+            print(f"  [security] no trigger word in {untriggered}; injection prefilter disabled")
         
         # Banned content patterns
         # Production: These are intentionally broad for demonstration
@@ -76,6 +124,73 @@ class InputValidator:
             r"bypass",
             # Production: Add domain-specific patterns
         ]
+        
+        # Compile once: the validator runs on every request, and re's
+        # internal pattern cache can evict and re-parse under load.
+        # With RE2 each list is fused into one alternation (see _PatternSet).
+        # None for an empty list: that search is skipped.
+        injection = [(f"inj{i}", p) for i, p in enumerate(self.injection_patterns)]
+        self._injection_re = _PatternSet(injection) if injection else None
+        
+        # Banned lists are mostly plain words and grow to hundreds of
+        # entries: match all literals in one Aho-Corasick pass and keep
+        # only real regexes in the alternation
+        banned = [(f"ban{i}", p) for i, p in enumerate(self.banned_patterns)]
+        literals = [(name, p) for name, p in banned if not _REGEX_METACHARS.intersection(p)]
+        self._banned_ac = _build_automaton(literals)
+        if self._banned_ac is not None:
+            handled = set(literals)
+            banned = [pair for pair in banned if pair not in handled]
+        self._banned_re = _PatternSet(banned) if banned else None
+        
+        # Hyperscan: one database over both lists, so an ASCII input gets
+        # every pattern checked in a single pass. None when not installed
+        # (or a pattern won't compile); the regex path above then runs.
+        hs_patterns = (
+            [(f"inj{i}", p) for i, p in enumerate(self.injection_patterns)]
+            + [(f"ban{i}", p) for i, p in enumerate(self.banned_patterns)]
+        )
+        self._hs_names = [name for name, _ in hs_patterns]
+        self._hs_db = _build_hyperscan_db(hs_patterns)
+        # Scratch space can't be shared by concurrent scans: one per thread
+        self._hs_local = threading.local()
+        # Python's \s also matches \x1c-\x1f, Hyperscan's doesn't: map
+        # them to \v, which both treat as whitespace
+        self._hs_input_table = bytes.maketrans(b"\x1c\x1d\x1e\x1f", b"\x0b" * 4)
+        self._ws_re = re.compile(r'\s+')
+        
+        # Character filters run in C via str.translate instead of
+        # per-character Python loops. Tables cover ASCII and are derived
+        # from the same str predicates the checks are defined by.
+        ascii_chars = [chr(c) for c in range(128)]
+        # Byte values deleted by bytes.translate: alnum and whitespace, so
+        # what's left is "special". Byte-level deletion runs on a 256-entry
+        # table without building a str, ~4x faster than str.translate.
+        self._alnum_space_bytes = bytes(
+            ord(c) for c in ascii_chars if c.isalnum() or c.isspace()
+        )
+        # Non-ASCII: \w is exactly isalnum() plus "_", \s is isspace()
+        self._special_re = re.compile(r'[^\w\s]|_')
+        # Deletes C0/DEL/C1 control characters (isspace() ones are kept)
+        self._control_drop = dict.fromkeys(
+            cp for cp in range(0xA0) if not (chr(cp).isprintable() or chr(cp).isspace())
+        )
+        
+        # Hot-path bindings: the heavy lifting already runs in C (regex
+        # engine, translate), so what's left per call is interpreter
+        # dispatch; pre-bound methods skip repeated attribute lookups.
+        # None when a list is empty (e.g. every banned word went to the
+        # automaton)
+        self._injection_search = self._injection_re.search if self._injection_re else None
+        self._banned_search = self._banned_re.search if self._banned_re else None
+        self._ws_sub = self._ws_re.sub
+        
+        # Repeated payloads (retried attacks, health checks) skip the scan.
+        # Per instance, since outcomes depend on this validator's config.
+        # 0 disables caching.
+        self._validate_cached = functools.lru_cache(maxsize=outcome_cache_size)(
+            self._validate_impl
+        )
     
     def validate(self, user_input: str, user_id: str = None) -> ValidationOutcome:
         """Validate user input through multiple checks.
@@ -87,16 +202,69 @@ class InputValidator:
         Returns:
             ValidationOutcome with result and sanitized input
         """
-        # 1. Length check (most critical for cost control)
+        # 1. Length check (most critical for cost control). Done before the
+        # cache so oversized payloads are never held as cache keys.
         if len(user_input) > self.max_length:
             return ValidationOutcome(
                 result=ValidationResult.REJECTED_LENGTH,
                 message=f"Input exceeds maximum length of {self.max_length} characters"
             )
         
+        # 2-3. Content checks depend only on the text: cached
+        outcome = self._validate_cached(user_input)
+        if outcome.result != ValidationResult.APPROVED:
+            return outcome
+        
+        # 4. Rate limiting (if user_id provided): per-request state, never cached
+        if user_id:
+            rate_ok, rate_msg = self._check_rate_limit(user_id)
+            if not rate_ok:
+                return ValidationOutcome(
+                    result=ValidationResult.REJECTED_RATE_LIMIT,
+                    message=rate_msg
+                )
+        
+        return outcome
+    
+    def validate_batch(
+        self,
+        inputs: List[str],
+        user_ids: Optional[List[Optional[str]]] = None
+    ) -> List[ValidationOutcome]:
+        """Validate many inputs in one call, outcomes in input order.
+        
+        For throughput pipelines (log scrubbing, offline safety review):
+        one call per batch instead of per item, and duplicates within or
+        across batches are served by the outcome cache.
+        """
+        if user_ids is None:
+            user_ids = [None] * len(inputs)
+        elif len(user_ids) != len(inputs):
+            raise ValueError(f"Got {len(inputs)} inputs but {len(user_ids)} user_ids")
+        
+        validate = self.validate
+        return [validate(text, user_id) for text, user_id in zip(inputs, user_ids)]
+    
+    def cache_info(self):
+        """Hit/miss statistics of the outcome cache (for monitoring)."""
+        return self._validate_cached.cache_info()
+    
+    def _validate_impl(self, user_input: str) -> ValidationOutcome:
+        """Run the text-only checks and sanitize; pure for a given config.
+        
+        Cached outcomes are shared between callers (they are frozen).
+        Pattern matches are logged on the first occurrence of a payload only.
+        """
+        # Hyperscan answers both pattern checks in one pass. ASCII only:
+        # there its case folding and \s agree with re's; other text takes
+        # the regex path.
+        hs_matches = None
+        if self._hs_db is not None and user_input.isascii():
+            hs_matches = self._hyperscan_matches(user_input)
+        
         # 2. Prompt injection detection
         if self.enable_injection_detection:
-            is_injection, injection_msg = self._detect_prompt_injection(user_input)
+            is_injection, injection_msg = self._detect_prompt_injection(user_input, hs_matches)
             if is_injection:
                 return ValidationOutcome(
                     result=ValidationResult.REJECTED_INJECTION,
@@ -105,22 +273,13 @@ class InputValidator:
         
         # 3. Content filtering
         if self.enable_content_filtering:
-            is_banned, content_msg = self._check_banned_content(user_input)
+            is_banned, content_msg = self._check_banned_content(user_input, hs_matches)
             if is_banned:
                 return ValidationOutcome(
                     result=ValidationResult.REJECTED_CONTENT,
                     message=content_msg
                 )
         
-        # 4. Rate limiting (if user_id provided)
-        if user_id:
-            rate_ok, rate_msg = self._check_rate_limit(user_id)
-            if not rate_ok:
-                return ValidationOutcome(
-                    result=ValidationResult.REJECTED_RATE_LIMIT,
-                    message=rate_msg
-                )
-        
         # All checks passed - sanitize and approve
         sanitized = self._sanitize(user_input)
         
@@ -130,38 +289,94 @@ class InputValidator:
             sanitized_input=sanitized
         )
     
-    def _detect_prompt_injection(self, text: str) -> Tuple[bool, str]:
+    def _hyperscan_matches(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """Scan ASCII text once; first (injection, banned) pattern names hit."""
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+        
+        # SINGLEMATCH: each pattern id is reported at most once
+        hit_ids = []
+        self._hs_db.scan(
+            text.encode("ascii").translate(self._hs_input_table),
+            match_event_handler=lambda pattern_id, start, end, flags, context: hit_ids.append(pattern_id),
+            scratch=scratch
+        )
+        names = [self._hs_names[i] for i in sorted(hit_ids)]
+        return (
+            next((name for name in names if name.startswith("inj")), None),
+            next((name for name in names if name.startswith("ban")), None),
+        )
+    
+    def _detect_prompt_injection(
+        self,
+        text: str,
+        hs_matches: Optional[Tuple[Optional[str], Optional[str]]] = None
+    ) -> Tuple[bool, str]:
         """Detect potential prompt injection attacks.
         
         Production: Use ML-based detection (e.g., fine-tuned classifier).
         This is a simple pattern-based approach for demonstration.
         """
-        text_lower = text.lower()
-        
-        for pattern in self.injection_patterns:
-            if re.search(pattern, text_lower):
-                return True, f"Potential prompt injection detected: pattern matched"
+        if hs_matches is not None:
+            pattern_name = hs_matches[0]
+        elif self._injection_search is None:
+            pattern_name = None
+        else:
+            text_lower = text.lower()
+            # Prefilter: a few C-level substring scans instead of the regex.
+            # Exact when the patterns also run on text_lower (stdlib re);
+            # with RE2's IGNORECASE, ASCII only, where the two agree.
+            if (
+                self._use_injection_prefilter
+                and (text.isascii() or self._injection_re.searches_lowered)
+                and not any(map(text_lower.__contains__, self.injection_triggers))
+            ):
+                pattern_name = None
+            else:
+                pattern_name = self._injection_search(text, text_lower)
+        if pattern_name:
+            print(f"  [security] injection pattern {pattern_name} matched")
+            return True, f"Potential prompt injection detected: pattern matched"
         
         # Check for excessive special characters (another injection indicator)
         # Production: This threshold should be tuned for your use case
         # Consider allowing higher ratios for code, math, or special domains
-        special_chars = sum(1 for c in text if not c.isalnum() and not c.isspace())
+        if text.isascii():
+            special_chars = len(text.encode("ascii").translate(None, self._alnum_space_bytes))
+        else:
+            special_chars = len(self._special_re.findall(text))
         if special_chars > len(text) * 0.3:
             return True, "Suspicious character distribution"
         
         return False, ""
     
-    def _check_banned_content(self, text: str) -> Tuple[bool, str]:
+    def _check_banned_content(
+        self,
+        text: str,
+        hs_matches: Optional[Tuple[Optional[str], Optional[str]]] = None
+    ) -> Tuple[bool, str]:
         """Check for banned content patterns.
         
         Production: Use content classification models (toxicity, hate speech, etc.).
         """
-        text_lower = text.lower()
+        if hs_matches is not None:
+            if hs_matches[1]:
+                print(f"  [security] banned pattern {hs_matches[1]} matched")
+                return True, f"Content policy violation detected"
+            return False, ""
         
-        for pattern in self.banned_patterns:
-            if re.search(pattern, text_lower):
+        text_lower = text.lower()
+        if self._banned_ac is not None:
+            for _, name in self._banned_ac.iter(text_lower):
+                print(f"  [security] banned pattern {name} matched")
                 return True, f"Content policy violation detected"
         
+        pattern_name = self._banned_search(text, text_lower) if self._banned_search else None
+        if pattern_name:
+            print(f"  [security] banned pattern {pattern_name} matched")
+            return True, f"Content policy violation detected"
+        
         return False, ""
     
     def _check_rate_limit(self, user_id: str) -> Tuple[bool, str]:
@@ -181,15 +396,107 @@ class InputValidator:
         This implementation removes ALL control characters for security.
         """
         # Remove excessive whitespace
-        sanitized = re.sub(r'\s+', ' ', text)
+        sanitized = self._ws_sub(' ', text)
         
         # Remove control characters (except common whitespace)
         # Production: Tune this based on your needs - may want to preserve \n, \t
-        sanitized = ''.join(char for char in sanitized if char.isprintable() or char.isspace())
+        # Whitespace is already collapsed to ' ', so isprintable() (one C
+        # pass) tells whether anything needs removing at all
+        if not sanitized.isprintable():
+            sanitized = sanitized.translate(self._control_drop)
+            # Rare leftovers: format, private-use or unassigned code points
+            if not sanitized.isprintable():
+                sanitized = ''.join(char for char in sanitized if char.isprintable() or char.isspace())
         
         return sanitized.strip()
 
 
+class _PatternSet:
+    """A non-empty list of (name, pattern) pairs searched as one unit.
+    
+    RE2: fused into one case-insensitive alternation with a named group
+    per pattern, so the input is scanned once in linear time however many
+    patterns there are.
+    
+    stdlib re: compiled one by one, case-sensitive, and searched in turn
+    over text.lower() (as the original checks did). A fused alternation
+    or IGNORECASE defeats re's literal-prefix fast search, so either is
+    slower there than separate searches over lowered text, not faster.
+    """
+    
+    def __init__(self, named_patterns: List[Tuple[str, str]]):
+        self.searches_lowered = _regex_engine is re
+        if self.searches_lowered:
+            self._fused_search = None
+            self._searches = [(name, re.compile(p).search) for name, p in named_patterns]
+        else:
+            alternation = "|".join(f"(?P<{name}>{p})" for name, p in named_patterns)
+            self._fused_search = _regex_engine.compile("(?i)" + alternation).search
+    
+    def search(self, text: str, text_lower: str) -> Optional[str]:
+        """Name of the first pattern that matches, or None.
+        
+        text_lower must be text.lower(); callers usually have it already.
+        """
+        if self._fused_search is not None:
+            match = self._fused_search(text)
+            return _matched_name(match) if match else None
+        
+        for name, search in self._searches:
+            if search(text_lower):
+                return name
+        return None
+
+
+def _build_automaton(named_literals: List[Tuple[str, str]]):
+    """Aho-Corasick automaton over lowercased literals, or None.
+    
+    Searched over text.lower(), the same folding the original per-pattern
+    checks used (casefold() would also fold e.g. "ß" to "ss").
+    
+    None when pyahocorasick isn't installed (literals then stay in the
+    regex alternation) or there are no literals.
+    """
+    if ahocorasick is None or not named_literals:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for name, literal in named_literals:
+        automaton.add_word(literal.lower(), name)
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_hyperscan_db(named_patterns: List[Tuple[str, str]]):
+    """Block-mode Hyperscan database over the patterns, or None.
+    
+    Pattern ids are list positions. None when hyperscan isn't installed,
+    there are no patterns, or one uses syntax Hyperscan rejects (e.g.
+    backreferences), so the regex path keeps working.
+    """
+    if hyperscan is None or not named_patterns:
+        return None
+    
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    try:
+        db.compile(
+            expressions=[p.encode() for _, p in named_patterns],
+            ids=list(range(len(named_patterns))),
+            elements=len(named_patterns),
+            flags=[flags] * len(named_patterns)
+        )
+    except hyperscan.error as e:
+        print(f"  [security] Hyperscan compile failed, using regex: {e}")
+        return None
+    return db
+
+
+def _matched_name(match) -> str:
+    """Name of the alternative that produced a fused-pattern match."""
+    return next(name for name, value in match.groupdict().items() if value is not None)
+
+
 def main():
     """Demonstrate input validation pattern."""
     print("=== Input Validation Pattern ===\n")
@@ -236,6 +543,17 @@ def main():
         
         print("-" * 50 + "\n")
     
+    # Batch validation, e.g. for offline review of logged prompts
+    batch = [t["input"] for t in test_inputs]
+    outcomes = validator.validate_batch(batch)
+    approved = sum(1 for o in outcomes if o.result == ValidationResult.APPROVED)
+    print(f"Batch: {approved}/{len(batch)} approved\n")
+    
+    # Same payload again: served from the outcome cache
+    validator.validate(test_inputs[1]["input"], "user_456")
+    info = validator.cache_info()
+    print(f"Outcome cache: {info.hits} hits, {info.misses} misses\n")
+    
     print("="*50)
     print("\nKey Takeaways:")
     print("1. Validate ALL user inputs before processing")